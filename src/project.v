@@ -47,12 +47,10 @@ module tt_um_attention_top (
     //-------------------------------------
     // MAC one row × one column of 4 features
     //-------------------------------------
-    typedef enum reg {
-      FIRST        = 1'b0,
-      WAIT4SECOND  = 1'b1
-    } input_reg_state_t;
+    localparam FIRST       = 1'b0;
+    localparam WAIT4SECOND = 1'b1;
 
-    input_reg_state_t input_reg_state;
+    reg                input_reg_state;
     reg  signed [7:0]  input_reg;
     reg  signed [16:0] mac_reg;
     reg  [1:0]         count_mac;
@@ -70,15 +68,14 @@ module tt_um_attention_top (
             count_mac       <= 2'd0;
             done_mac        <= 1'd0;
         end else begin
+            done_mac <= 1'b0; // one-cycle pulse: latch each dot's result exactly once
             case (input_reg_state)
                 FIRST: begin
                     if ( (vld_slv_in == 1'b1) && (rdy_slv_out_w == 1'b1) ) begin
                         input_reg       <= qv_slv_in;
                         input_reg_state <= WAIT4SECOND;
-                        if (count_mac == 2'd0) begin
+                        if (count_mac == 2'd0)
                             mac_reg <= 17'd0;
-                            done_mac <= 1'b0;
-                        end
                     end
                 end
                 WAIT4SECOND: begin
@@ -116,16 +113,17 @@ module tt_um_attention_top (
             vld_mst_out_w  <= 1'b0;
             ex_output_reg  <= 9'd0;
         end else begin
+            // Drop valid once master has acknowledged
+            if ( (rdy_mst_in == 1'b1) && (vld_mst_out_w == 1'b1) ) begin
+                vld_mst_out_w <= 1'b0;
+            end
+
             // When 4th multiply done, latch exp() output and raise valid
+            // (takes priority over a same-cycle acknowledge of the previous result)
             if ( done_mac == 1'b1 ) begin
                 vld_mst_out_w <= 1'b1;
                 ex_output_reg <= ex_output;
             end
-
-            // Drop valid once master has acknowledged
-            if ( (rdy_mst_in == 1'b1) && (vld_mst_out_w == 1'b1) ) begin
-                vld_mst_out_w <= 1'b0;
-            end
         end
     end
 
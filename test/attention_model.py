@@ -0,0 +1,158 @@
+"""
+Bit-accurate golden model of the attention datapath, softmax(QK^T)V,
+for d_k = 4, n = 4, vectorized over a batch of (Q, K, V) sequences.
+
+Stages (README "How to do it"):
+  score   : Q0.7 x Q0.7 MAC -> 17b Q2.14 -> >>>1 -> [16:9] Q1.6   (mac_model)
+  exp     : range-reduced polynomial e^x -> UQ3.6                  (ex_model)
+  sum     : Z = sum_j e[j], carried in Q0.16
+  recip   : normalize Z into [0.5,1), seed 48/17 - 32/17*Z1, one Newton step (recip_model)
+  weights : a[j] = (e[j] * R) >> 16                                (Q0.16)
+  output  : O = sum_j a[j] * V[j] >> 16                             (Q0.7, saturated)
+Widths after the exp stage are unconstrained until the softmax RTL lands.
+
+The softmax half (sum, recip, weights, output) also runs on its own over
+rows of exponentials that came off the hardware (softmax_fixed), which is
+how test_attention.py finishes streamed attention rows offline.
+
+Run as a script to characterize accuracy against float64 attention at the
+datapath's own logit scale (QK^T / 4, see LOGIT_SCALE):
+    python attention_model.py --sequences 1000000
+"""
+import argparse
+from typing import NamedTuple
+
+import numpy as np
+
+from ex_model import ex_lookup
+from fixedpoint import saturate, signext
+from mac_model import mac_path_batch
+from recip_model import recip_newton_q16
+
+D_K = 4
+N_TOK = 4
+
+ONE_Q16 = 1 << 16
+
+# Logit scale the datapath actually applies. The Q0.7 x Q0.7 products sum to
+# mac_sum = s * 2^14 for the real dot s = q.k. mac_div2 = mac_sum >>> 1, and its
+# [16:9] slice, read as Q1.6, is x = (mac_sum >> 10) / 2^6 = mac_sum / 2^16 = s / 4.
+# So ex() sees s/4, not the s/sqrt(d_k) = s/2 of the README formula, and the
+# float reference follows the RTL (as error_dist.py does).
+LOGIT_SCALE = 0.25
+
+# ---------------- fixed-point stages ----------------
+class AttentionResult(NamedTuple):
+    x_q16: np.ndarray     # (B, n, n)    Q1.6 logits seen by ex()
+    e_q6: np.ndarray      # (B, n, n)    UQ3.6 exponentials
+    z_q16: np.ndarray     # (B, n)       row sums, Q0.16
+    r_q16: np.ndarray     # (B, n)       reciprocals, Q0.16
+    a_q16: np.ndarray     # (B, n, n)    softmax weights, Q0.16
+    out_q7: np.ndarray    # (B, n, d_v)  outputs, Q0.7 int8
+
+def attention_fixed(q, k, v) -> AttentionResult:
+    """
+    Fixed-point attention over a batch.
+    q, k: (B, n, d_k) int8 Q0.7 codes; v: (B, n, d_v) or (B, n) int8 Q0.7 codes.
+    """
+    q = signext(q, 8)
+    k = signext(k, 8)
+    v = signext(v, 8)
+    if v.ndim == 2:
+        v = v[..., None]
+
+    # Every (query i, key j) pair as one MAC dot: (B, n, n, d_k, 2)
+    pairs = np.stack(np.broadcast_arrays(q[:, :, None, :], k[:, None, :, :]), axis=-1)
+    x = mac_path_batch(pairs).mac_reduced
+    e = ex_lookup(x)
+    z, r, a, out = softmax_fixed(e, v[:, None])
+    return AttentionResult(x, e, z, r, a, out)
+
+def softmax_fixed(e_q6, v):
+    """
+    Softmax normalization and weighted sum for rows of UQ3.6 exponentials.
+    e_q6: (..., n) codes; v: (..., n, d_v) int8 Q0.7 codes, broadcast against e_q6's leading axes.
+    Returns (z, r, a, out) as in AttentionResult.
+    """
+    e_q16 = np.asarray(e_q6, dtype=np.int64) << 10           # UQ3.6 -> Q0.16
+    z = e_q16.sum(axis=-1)
+    r = recip_newton_q16(z)
+    a = (e_q16 * r[..., None]) >> 16
+
+    o = np.einsum("...j,...jd->...d", a, signext(v, 8)) >> 16
+    return z, r, a, saturate(o, 8)
+
+def row_pairs(q, k) -> np.ndarray:
+    """
+    MAC operands of attention rows, one query against n keys each.
+    q: (R, d_k), k: (R, n, d_k) int8 codes -> (R, n, d_k, 2): row r's n dots in key order, (q, k) per term.
+    """
+    return np.stack(np.broadcast_arrays(np.asarray(q)[:, None, :], np.asarray(k)), axis=-1)
+
+# ---------------- float reference and error report ----------------
+class AttentionError(NamedTuple):
+    softmax_err: np.ndarray   # (B, n)       max |a - p| over each row
+    out_err: np.ndarray       # (B, n, d_v)  |O_fixed - O_float|
+
+def attention_float(q, k, v):
+    """float64 softmax(QK^T * LOGIT_SCALE) V on the decoded Q0.7 inputs. Returns (p, out)."""
+    qf = signext(q, 8) / 128.0
+    kf = signext(k, 8) / 128.0
+    vf = signext(v, 8) / 128.0
+    if vf.ndim == 2:
+        vf = vf[..., None]
+    s = np.einsum("bid,bjd->bij", qf, kf) * LOGIT_SCALE
+    p = np.exp(s - s.max(axis=-1, keepdims=True))
+    p /= p.sum(axis=-1, keepdims=True)
+    return p, np.einsum("bij,bjd->bid", p, vf)
+
+def attention_error(q, k, v, res: AttentionResult = None) -> AttentionError:
+    """Per-row softmax and per-output error of the fixed-point engine vs float64."""
+    if res is None:
+        res = attention_fixed(q, k, v)
+    p, out_ref = attention_float(q, k, v)
+    softmax_err = np.abs(res.a_q16 / ONE_Q16 - p).max(axis=-1)
+    out_err = np.abs(res.out_q7 / 128.0 - out_ref)
+    return AttentionError(softmax_err, out_err)
+
+def random_qkv(rng, batch: int, n: int = N_TOK, d_k: int = D_K, d_v: int = 1):
+    """Uniform int8 Q0.7 (Q, K, V) codes."""
+    q = rng.integers(-128, 128, size=(batch, n, d_k), dtype=np.int64)
+    k = rng.integers(-128, 128, size=(batch, n, d_k), dtype=np.int64)
+    v = rng.integers(-128, 128, size=(batch, n, d_v), dtype=np.int64)
+    return q, k, v
+
+def characterize(sequences: int, seed: int = 0, chunk: int = 1 << 16) -> dict:
+    """Accuracy summary over 'sequences' random sequences, processed in bounded-memory chunks."""
+    rng = np.random.default_rng(seed)
+    sm_max = out_max = 0.0
+    sm_sum = out_sum = out_sq = 0.0
+    rows = outs = 0
+    for start in range(0, sequences, chunk):
+        q, k, v = random_qkv(rng, min(chunk, sequences - start))
+        err = attention_error(q, k, v)
+        sm_max  = max(sm_max, float(err.softmax_err.max()))
+        out_max = max(out_max, float(err.out_err.max()))
+        sm_sum  += float(err.softmax_err.sum())
+        out_sum += float(err.out_err.sum())
+        out_sq  += float(np.square(err.out_err).sum())
+        rows += err.softmax_err.size
+        outs += err.out_err.size
+    return {
+        "sequences": sequences,
+        "seed": seed,
+        "softmax_err_max": sm_max,
+        "softmax_err_mean": sm_sum / rows,
+        "out_err_max": out_max,
+        "out_err_mean": out_sum / outs,
+        "out_err_rms": float(np.sqrt(out_sq / outs)),
+    }
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--sequences", type=int, default=1 << 20)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--chunk", type=int, default=1 << 16)
+    args = ap.parse_args()
+    for key, val in characterize(args.sequences, args.seed, args.chunk).items():
+        print(f"{key:>18}: {val}")
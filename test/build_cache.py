@@ -0,0 +1,236 @@
+"""
+Content-hashed simulator build cache under sim_build/cache/.
+
+The Makefile asks for a build directory once per make invocation that builds
+or simulates (not for clean or report):
+
+    python build_cache.py dir icarus --owner <make pid> --image sim.vvp --args="<COMPILE_ARGS> <EXTRA_ARGS>" <sources>
+
+The key hashes the simulator name and version, the cocotb install, the
+compile arguments (defines such as GL_TEST or EX_ONLY included), and the
+contents of every source and `include`d file. A complete entry
+(sim_build/cache/<sim>-<key>/) is returned as is, with its image files
+touched so make does not rebuild it from source mtimes. On a miss, or with
+make -B, a private staging directory next to it is returned instead. The
+Makefile calls "publish" once the image is built, which renames the staging
+directory into place and leaves a symlink behind for the running simulation.
+Concurrent runs therefore never compile into a shared directory. If two of
+them build the same key, the first publish wins and the other keeps its
+private copy; a make -B build replaces the published entry instead.
+
+Each staging directory records the pid of the make that asked for it. Once
+that process is gone the directory (or the symlink left by publish) is
+stale: every lookup, make clean and prune remove it, so a run that never
+builds does not leak one. Without an owner, staging older than STAGING_TTL
+is stale.
+
+    python build_cache.py list
+    python build_cache.py prune --keep 4     # per simulator, least recently used first
+    python build_cache.py prune --staging    # stale staging only (make clean)
+"""
+import argparse
+import hashlib
+import importlib.metadata
+import importlib.util
+import json
+import os
+import re
+import shlex
+import shutil
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+TEST_DIR    = Path(__file__).resolve().parent
+CACHE_DIR   = TEST_DIR / "sim_build" / "cache"
+STAMP       = ".build_key.json"
+OWNER       = ".owner"
+STAGING     = ".staging-"
+STAGING_TTL = 24 * 3600   # staging without an owner pid is kept this long (a run may still use it)
+
+INCLUDE_RE = re.compile(rb'^\s*`include\s+"([^"]+)"', re.M)
+VERSION_CMD = {
+    "icarus": ["iverilog", "-V"],
+    "verilator": ["verilator", "--version"],
+}
+
+def sim_version(sim: str) -> str:
+    """First line of the simulator's version banner ("" if it cannot be run)."""
+    cmd = VERSION_CMD.get(sim, [sim, "--version"])
+    try:
+        out = subprocess.run(cmd, capture_output=True, text=True, timeout=30).stdout
+    except (OSError, subprocess.TimeoutExpired):
+        return ""
+    return out.strip().splitlines()[0] if out.strip() else ""
+
+def cocotb_version() -> str:
+    """Version and install location; the VPI libraries linked into the image live there."""
+    spec = importlib.util.find_spec("cocotb")
+    if spec is None:
+        return ""
+    return f"{importlib.metadata.version('cocotb')} {Path(spec.origin).parent}"
+
+def include_dirs(args) -> list:
+    dirs = []
+    for arg in args:
+        if arg.startswith("-I"):
+            dirs.append(Path(arg[2:]))
+        elif arg.startswith("+incdir+"):
+            dirs.extend(Path(d) for d in arg[len("+incdir+"):].split("+") if d)
+    return dirs
+
+def source_files(sources, args) -> list:
+    """The sources plus every file they `include (transitively), resolved against the include dirs."""
+    dirs = include_dirs(args)
+    seen, todo, files = set(), [Path(s) for s in sources], []
+    while todo:
+        path = todo.pop(0)
+        if path in seen or not path.is_file():
+            continue
+        seen.add(path)
+        files.append(path)
+        for name in INCLUDE_RE.findall(path.read_bytes()):
+            name = name.decode()
+            for d in (path.parent, *dirs):
+                if (d / name).is_file():
+                    todo.append(d / name)
+                    break
+    return files
+
+def build_key(sim: str, args, sources) -> dict:
+    """Everything the compiled image depends on, plus its short hash under "key"."""
+    args = list(args)
+    files = source_files(sources, args)
+    record = {
+        "sim": sim,
+        "sim_version": sim_version(sim),
+        "cocotb": cocotb_version(),
+        "args": args,
+        "sources": {str(p): hashlib.sha256(p.read_bytes()).hexdigest() for p in files},
+    }
+    blob = json.dumps({**record, "sources": sorted(record["sources"].values())}, sort_keys=True)
+    record["key"] = hashlib.sha256(blob.encode()).hexdigest()[:16]
+    return record
+
+def entry_dir(record: dict) -> Path:
+    return CACHE_DIR / f"{record['sim']}-{record['key']}"
+
+def build_dir(sim: str, args, sources, image=(), fresh: bool = False, owner: int = None) -> Path:
+    """The cached entry on a hit, otherwise a new private staging directory owned by pid owner."""
+    prune_staging()
+    record = build_key(sim, args, sources)
+    final = entry_dir(record)
+    stamp = final / STAMP
+    if not fresh and stamp.is_file() and all((final / f).exists() for f in image):
+        for name in image:                   # in dependency order; equal times count as up to date
+            os.utime(final / name)
+        os.utime(stamp)                      # least-recently-used order for prune
+        return final
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    staging = Path(tempfile.mkdtemp(prefix=final.name + STAGING, dir=CACHE_DIR))
+    if owner is not None:
+        (staging / OWNER).write_text(str(owner))
+    (staging / STAMP).write_text(json.dumps({**record, "fresh": fresh}, indent=1))
+    return staging
+
+def publish(staging: Path) -> Path:
+    """Move a finished staging build into its cache entry; returns the directory the run should use."""
+    staging = Path(staging)
+    if staging.is_symlink() or STAGING not in staging.name:
+        return staging                       # already published, or a cache hit
+    final = CACHE_DIR / staging.name.split(STAGING)[0]
+    replaced = None
+    if json.loads((staging / STAMP).read_text()).get("fresh") and final.is_dir():
+        replaced = Path(tempfile.mkdtemp(prefix=final.name + STAGING + "replaced-", dir=CACHE_DIR))
+        final.rename(replaced / final.name)  # make -B: its build supersedes the published one
+    try:
+        staging.rename(final)
+    except OSError:                          # another run published this key first
+        return staging
+    staging.symlink_to(final.name)
+    if replaced is not None:
+        shutil.rmtree(replaced, ignore_errors=True)
+    return final
+
+def owner_alive(path: Path) -> bool:
+    """True while the make that created staging directory path may still use it."""
+    try:
+        pid = int((path / OWNER).read_text())
+    except (OSError, ValueError):
+        return time.time() - path.lstat().st_mtime <= STAGING_TTL
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:                  # alive, another user's
+        pass
+    return True
+
+def prune_staging() -> list:
+    """Remove staging directories and publish symlinks whose make has exited."""
+    removed = []
+    for path in CACHE_DIR.glob(f"*{STAGING}*"):
+        if path.is_symlink():
+            if path.exists() and owner_alive(path):
+                continue
+            path.unlink()
+        elif owner_alive(path):
+            continue
+        else:
+            shutil.rmtree(path, ignore_errors=True)
+        removed.append(path)
+    return removed
+
+def entries() -> list:
+    """(path, record, last use) of every complete entry, most recent first."""
+    found = []
+    for stamp in CACHE_DIR.glob(f"*/{STAMP}"):
+        path = stamp.parent
+        if STAGING in path.name or path.is_symlink():
+            continue
+        found.append((path, json.loads(stamp.read_text()), stamp.stat().st_mtime))
+    return sorted(found, key=lambda e: -e[2])
+
+def prune(keep: int) -> list:
+    """Drop all but the `keep` most recently used entries per simulator, and stale staging dirs and links."""
+    removed = prune_staging()
+    per_sim = {}
+    for path, record, _ in entries():
+        per_sim.setdefault(record["sim"], []).append(path)
+    for paths in per_sim.values():
+        for path in paths[keep:]:
+            shutil.rmtree(path, ignore_errors=True)
+            removed.append(path)
+    return removed
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    get = sub.add_parser("dir", help="print the build directory for this configuration")
+    get.add_argument("sim")
+    get.add_argument("--args", default="", help="compile arguments, as one shell-quoted string")
+    get.add_argument("--image", action="append", default=[], help="build product (repeat, in dependency order)")
+    get.add_argument("--fresh", action="store_true", help="build in a private directory and replace the entry (make -B)")
+    get.add_argument("--owner", type=int, default=None, help="pid of the make using the directory")
+    get.add_argument("sources", nargs="+")
+    pub = sub.add_parser("publish", help="move a finished staging build into the cache")
+    pub.add_argument("dir", type=Path)
+    sub.add_parser("list", help="show the cache entries")
+    pr = sub.add_parser("prune", help="remove old entries")
+    pr.add_argument("--keep", type=int, default=4, help="entries kept per simulator")
+    pr.add_argument("--staging", action="store_true", help="only remove stale staging directories and links")
+    args = ap.parse_args()
+
+    if args.cmd == "dir":
+        print(build_dir(args.sim, shlex.split(args.args), args.sources, args.image, args.fresh, args.owner))
+    elif args.cmd == "publish":
+        publish(args.dir)
+    elif args.cmd == "list":
+        for path, record, used in entries():
+            defines = " ".join(a for a in record["args"] if a.startswith("-D"))
+            print(f"{path.name}  {time.strftime('%Y-%m-%d %H:%M', time.localtime(used))}  "
+                  f"{record['sim_version']}  {defines}")
+    else:
+        for path in prune_staging() if args.staging else prune(args.keep):
+            print(f"removed {path}")
@@ -0,0 +1,132 @@
+"""
+Exact distribution of the ex() error over the whole dot-product input space.
+
+The four int8 x int8 products of a dot are independent, so the distribution
+of mac_sum is the convolution of the four per-term product histograms. That
+distribution is pushed through the 17-bit register, >>>1 and [16:9]
+(mac_model.mac_reduce) onto the 256 Q1.6 codes and through the ex() table,
+giving exact worst-case and probability-weighted errors for any operand
+distribution, with no sampling and without enumerating 2^64 dots.
+
+Two errors are reported:
+  ex  : |ex(x)/64 - exp(x/64)| for the reduced code x (what test.py checks)
+  e2e : |ex(x)/64 - exp(mac_sum/2^16)| against the untruncated value x
+        stands for, so it also covers the [16:9] truncation and the
+        17-bit wrap of the all -128 dot. (Read as Q1.6, the [16:9] slice of
+        the Q2.14 register scales the dot by 1/4; the reference follows the RTL.)
+
+    python error_dist.py                  # uniform int8 operands
+    python error_dist.py --max-code 127   # uniform on [-127, 127] (test.py's stimulus)
+"""
+import argparse
+import functools
+from typing import NamedTuple
+
+import numpy as np
+
+from ex_model import ex_table
+from mac_model import mac_reduce
+
+N_TERMS  = 4
+CODES    = np.arange(-128, 128)     # int8 operand codes; pmf index = code + 128
+PROD_MIN = -128 * 127
+PROD_MAX = 128 * 128
+
+class Dist(NamedTuple):
+    lo: int               # value of pmf[0]
+    pmf: np.ndarray       # probability of lo + i
+    support: np.ndarray   # exact reachability of lo + i (pmf may round to 0)
+
+    @property
+    def values(self) -> np.ndarray:
+        return self.lo + np.arange(len(self.pmf))
+
+def uniform_pmf(lo: int = -128, hi: int = 127) -> np.ndarray:
+    """Operand pmf uniform over the codes lo..hi."""
+    pmf = ((CODES >= lo) & (CODES <= hi)).astype(np.float64)
+    return pmf / pmf.sum()
+
+def product_dist(pa, pb) -> Dist:
+    """Distribution of a*b for independent operands with pmfs pa, pb (indexed by code + 128)."""
+    idx = (CODES[:, None] * CODES[None, :] - PROD_MIN).ravel()
+    size = PROD_MAX - PROD_MIN + 1
+    pmf = np.bincount(idx, weights=np.outer(pa, pb).ravel(), minlength=size)
+    support = np.bincount(idx, weights=np.outer(pa > 0, pb > 0).ravel(), minlength=size) > 0
+    return Dist(PROD_MIN, pmf, support)
+
+def _fft_convolve(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    n = len(a) + len(b) - 1
+    nfft = 1 << (n - 1).bit_length()
+    return np.fft.irfft(np.fft.rfft(a, nfft) * np.fft.rfft(b, nfft), nfft)[:n]
+
+def convolve(a: Dist, b: Dist) -> Dist:
+    """Distribution of the sum of two independent variables."""
+    pmf = np.maximum(_fft_convolve(a.pmf, b.pmf), 0.0)
+    # counts of support pairs are small integers, so rounding the FFT is exact
+    support = np.rint(_fft_convolve(a.support.astype(np.float64), b.support.astype(np.float64))) > 0
+    return Dist(a.lo + b.lo, np.where(support, pmf, 0.0), support)
+
+def mac_sum_dist(pa=None, pb=None) -> Dist:
+    """
+    Exact mac_sum distribution. pa, pb: operand pmfs of shape (256,) shared by
+    all terms or (N_TERMS, 256) per term; None means uniform int8.
+    """
+    pa = np.broadcast_to(uniform_pmf() if pa is None else np.asarray(pa, dtype=np.float64), (N_TERMS, 256))
+    pb = np.broadcast_to(uniform_pmf() if pb is None else np.asarray(pb, dtype=np.float64), (N_TERMS, 256))
+    terms = [product_dist(pa[t] / pa[t].sum(), pb[t] / pb[t].sum()) for t in range(N_TERMS)]
+    # pairwise tree keeps the FFT lengths balanced
+    while len(terms) > 1:
+        terms = [convolve(terms[i], terms[i + 1]) if i + 1 < len(terms) else terms[i]
+                 for i in range(0, len(terms), 2)]
+    return terms[0]
+
+class ErrorReport(NamedTuple):
+    code_pmf: np.ndarray     # (256,) probability of each reduced code, indexed by code + 128
+    ex_err_max: float        # worst |ex(x)/64 - exp(x/64)| over reachable codes
+    ex_err_max_code: int
+    ex_err_mean: float
+    e2e_err_max: float       # worst |ex(x)/64 - exp(mac_sum/2^16)| over reachable sums
+    e2e_err_max_sum: int
+    e2e_err_mean: float
+
+def analyze(pa=None, pb=None) -> ErrorReport:
+    dist = mac_sum_dist(pa, pb)
+    sums = dist.values[dist.support]
+    prob = dist.pmf[dist.support]
+    prob = prob / prob.sum()
+    code = mac_reduce(sums).mac_reduced
+    y = ex_table()[code & 0xFF] / 64.0
+
+    code_pmf = np.bincount(code + 128, weights=prob, minlength=256)
+    reachable = np.bincount(code + 128, minlength=256) > 0
+    ex_err = np.abs(ex_table()[CODES & 0xFF] / 64.0 - np.exp(CODES / 64.0))
+    ex_err_r = np.where(reachable, ex_err, -1.0)
+    e2e_err = np.abs(y - np.exp(sums / 2.0 ** 16))
+    worst = int(np.argmax(e2e_err))
+    return ErrorReport(
+        code_pmf=code_pmf,
+        ex_err_max=float(ex_err_r.max()),
+        ex_err_max_code=int(CODES[np.argmax(ex_err_r)]),
+        ex_err_mean=float((ex_err * code_pmf).sum()),
+        e2e_err_max=float(e2e_err[worst]),
+        e2e_err_max_sum=int(sums[worst]),
+        e2e_err_mean=float((e2e_err * prob).sum()),
+    )
+
+@functools.lru_cache(maxsize=None)
+def ex_error_bound() -> float:
+    """Worst ex() error over every code reachable from any int8 dot; test tolerance."""
+    return analyze().ex_err_max
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--max-code", type=int, default=None,
+                    help="operands uniform on [-max_code, max_code] (default: all int8)")
+    args = ap.parse_args()
+    pmf = None if args.max_code is None else uniform_pmf(-args.max_code, args.max_code)
+    rep = analyze(pmf, pmf)
+    for key, val in rep._asdict().items():
+        if key != "code_pmf":
+            print(f"{key:>16}: {val}")
+    top = np.argsort(rep.code_pmf)[::-1][:5]
+    print("most likely codes: " + ", ".join(f"{CODES[i]} ({rep.code_pmf[i]:.4f})" for i in top))
@@ -0,0 +1,105 @@
+"""
+Functional coverage of the ex() domain and a directed stimulus index.
+
+Bins, all restricted to what the MAC path can actually produce:
+  code    : every reachable Q1.6 mac_reduced code
+  n_round : every range-reduction exponent n = round(x/ln2)
+  r_corner: the smallest and largest reduced argument r for each n
+  branch  : 2^n shift left / none / right, and the 9-bit saturation
+
+Only codes -64..63 are reachable: [16:9] of the >>>1 register spans a
+quarter of the int8 range, and +64 needs the all -128 dot that wraps to -64.
+n, r and the branches are functions of the code, so one dot per reachable
+code (directed_stimulus()) is the minimum that closes every bin.
+"""
+import functools
+
+import numpy as np
+
+from error_dist import CODES, mac_sum_dist
+from ex_model import ex_stages
+from mac_model import mac_path_batch, mac_reduce
+
+BRANCHES = ("shift_left", "no_shift", "shift_right", "saturate")
+
+@functools.lru_cache(maxsize=None)
+def reachable_codes() -> np.ndarray:
+    """Sorted int8 codes that some int8 dot reduces to (exact, from the mac_sum support)."""
+    dist = mac_sum_dist()
+    return np.unique(mac_reduce(dist.values[dist.support]).mac_reduced)
+
+def _bins(codes) -> dict:
+    """Coverage bin -> set of hit keys for a set of codes."""
+    st = ex_stages(codes)
+    n, r = st.n_round, st.r_q16
+    corners = set()
+    for nv in np.unique(n):
+        sel = r[n == nv]
+        corners |= {(int(nv), int(sel.min())), (int(nv), int(sel.max()))}
+    branch = {BRANCHES[0] if v > 0 else BRANCHES[1] if v == 0 else BRANCHES[2] for v in n.tolist()}
+    if (st.uq36_pre > 0x1FF).any():
+        branch.add(BRANCHES[3])
+    return {"code": set(np.asarray(codes).tolist()),
+            "n_round": set(n.tolist()),
+            "r_corner": corners,
+            "branch": branch}
+
+@functools.lru_cache(maxsize=None)
+def coverage_goals() -> dict:
+    return _bins(reachable_codes())
+
+@functools.lru_cache(maxsize=None)
+def directed_stimulus() -> np.ndarray:
+    """
+    (len(reachable_codes()), 4, 2) unsigned Q0.7 (Q, K) codes; dot i reduces to reachable_codes()[i].
+    Each dot aims at the middle of its code's 1024-wide mac_sum bin: three terms
+    take the product nearest a quarter of the target, the fourth the nearest remainder.
+    """
+    prods = (CODES[:, None] * CODES[None, :]).ravel()
+    order = np.argsort(prods, kind="stable")
+    sorted_prods = prods[order]
+
+    def nearest(t):
+        i = np.clip(np.searchsorted(sorted_prods, t), 1, len(sorted_prods) - 1)
+        i = np.where(np.abs(sorted_prods[i - 1] - t) <= np.abs(sorted_prods[i] - t), i - 1, i)
+        flat = order[i]
+        return np.stack([CODES[flat // 256], CODES[flat % 256]], axis=-1)
+
+    codes = reachable_codes()
+    lo = mac_sum_dist().lo
+    target = np.clip(codes * 1024 + 512, lo, 4 * 128 * 127)
+    first = nearest(target // 4)
+    rest = target - 3 * first[:, 0] * first[:, 1]
+    last = nearest(rest)
+    pairs = np.stack([first, first, first, last], axis=1) & 0xFF
+
+    got = mac_path_batch(pairs).mac_reduced
+    assert (got == codes).all(), f"directed index misses codes {codes[got != codes].tolist()}"
+    return pairs
+
+class ExCoverage:
+    """Accumulates which coverage bins the ex() inputs of a run have hit."""
+
+    def __init__(self):
+        self.code_hits = np.zeros(256, dtype=np.int64)   # indexed by code & 0xFF
+
+    def sample(self, x_q16):
+        self.code_hits += np.bincount(np.asarray(x_q16, dtype=np.int64).ravel() & 0xFF, minlength=256)
+
+    def report(self) -> dict:
+        """Per bin: hit / goal counts, percentage and the missing keys."""
+        seen = CODES[self.code_hits[CODES & 0xFF] > 0]
+        hit = _bins(seen) if seen.size else {k: set() for k in coverage_goals()}
+        out = {}
+        for name, goal in coverage_goals().items():
+            missing = sorted(goal - hit[name])
+            out[name] = {"hit": len(goal) - len(missing), "goal": len(goal),
+                         "pct": round(100.0 * (len(goal) - len(missing)) / len(goal), 2),
+                         "missing": [list(m) if isinstance(m, tuple) else m for m in missing]}
+        return out
+
+    def complete(self) -> bool:
+        return all(b["hit"] == b["goal"] for b in self.report().values())
+
+    def summary(self) -> str:
+        return ", ".join(f"{name} {b['hit']}/{b['goal']}" for name, b in self.report().items())
@@ -0,0 +1,218 @@
+"""
+Design-space exploration of the exp unit (src/ex.v).
+
+ex_param() is a parameterized, vectorized version of the ex() datapath:
+  n = round((x * INV) >> k  /  2^in_frac)      INV = round(2^k / ln2), n wrapped to n_bits
+  r = x - n * LN2                              LN2 in input units (44 for in_frac = 6)
+  e^r ~ 1 + r + r^2/2 (+ r^3/6)                Q0.poly_frac, truncating like the RTL
+  y = e^r * 2^n  -> UQ3.out_frac, saturated
+The default ExConfig() reproduces ex_model.ex_table() bit for bit.
+
+Every configuration is scored exhaustively over the 256 Q1.6 codes the MAC
+delivers, against exp of that exact code. A unit with fewer input fraction
+bits sees the code truncated to Q1.in_frac first (its input wiring drops the
+LSBs), so the truncation error counts against it. Each point also gets a
+gate-cost proxy in full-adder
+equivalents: shift-add constant multipliers cost (nonzero CSD digits - 1)
+adders of the operand width, r^2 / r^3 multipliers width^2, the 2^n barrel
+shifter width x log2 stages. The sweep runs over a process pool and
+writes every point plus the (cost, max error) Pareto front:
+
+    python ex_dse.py                      # full grid, all cores
+    python ex_dse.py --jobs 4 --out dse.json
+"""
+import argparse
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple
+
+import numpy as np
+
+from fixedpoint import round_shift, saturate, shift, signext
+
+class ExConfig(NamedTuple):
+    in_frac: int = 6      # x is Q1.in_frac
+    k_inv: int = 6        # 1/ln2 constant round(2^k / ln2): 92 for k = 6
+    ln2_adj: int = 0      # LN2 = round(2^in_frac * ln2) + ln2_adj: 44 for in_frac = 6
+    n_bits: int = 3       # n_round width
+    degree: int = 2       # polynomial degree (1..3)
+    poly_frac: int = 16   # polynomial arithmetic in Q0.poly_frac
+    out_frac: int = 6     # y is UQ3.out_frac
+
+    @property
+    def inv_ln2(self) -> int:
+        return int(round(2 ** self.k_inv / np.log(2)))
+
+    @property
+    def ln2(self) -> int:
+        return int(round(2 ** self.in_frac * np.log(2))) + self.ln2_adj
+
+MAC_FRAC = 6   # the MAC hands ex() a Q1.6 code (mac_reduced)
+
+def input_codes(cfg: ExConfig) -> np.ndarray:
+    half = 1 << (cfg.in_frac + 1)
+    return np.arange(-half, half)
+
+def mac_codes() -> np.ndarray:
+    """Every Q1.6 code the MAC can deliver; the common stimulus for scoring."""
+    return np.arange(-(1 << (MAC_FRAC + 1)), 1 << (MAC_FRAC + 1))
+
+def from_mac(x6, cfg: ExConfig) -> np.ndarray:
+    """Q1.6 MAC codes as the unit's Q1.in_frac input: LSBs dropped (>>>) or zero-padded."""
+    return shift(x6, cfg.in_frac - MAC_FRAC)
+
+class ExParamStages(NamedTuple):
+    t: np.ndarray      # (x * INV) >> k_inv
+    n: np.ndarray      # round(t / 2^in_frac) wrapped to n_bits
+    r: np.ndarray      # x - n * LN2, input units
+    r_p: np.ndarray    # r in Q0.poly_frac
+    r2: np.ndarray     # r^2, Q0.poly_frac (degree >= 2)
+    r3: np.ndarray     # r^3, Q0.poly_frac (degree 3)
+    e: np.ndarray      # polynomial e^r, Q0.poly_frac
+    e_n: np.ndarray    # e^r * 2^n, Q0.poly_frac
+    y: np.ndarray      # UQ3.out_frac before saturation
+    result: np.ndarray
+
+def ex_param_stages(x, cfg: ExConfig = ExConfig()) -> ExParamStages:
+    """ex_param with every intermediate exposed (ex_gen.py sizes its wires from them)."""
+    x = np.asarray(x, dtype=np.int64)
+    t = (x * cfg.inv_ln2) >> cfg.k_inv
+    n = signext(round_shift(t, cfg.in_frac), cfg.n_bits)
+    r = x - n * cfg.ln2
+
+    p = cfg.poly_frac
+    r_p = shift(r, p - cfg.in_frac)
+    e = (1 << p) + r_p
+    r2 = r3 = np.zeros_like(x)
+    if cfg.degree >= 2:
+        r2 = (r_p * r_p) >> p
+        e = e + (r2 >> 1)
+    if cfg.degree >= 3:
+        r3 = (r2 * r_p) >> p
+        e = e + ((r3 * int(round(2 ** p / 6))) >> p)
+
+    e_n = shift(e, n)
+    y = shift(e_n, cfg.out_frac - p)
+    return ExParamStages(t, n, r, r_p, r2, r3, e, e_n, y, saturate(y, cfg.out_frac + 3, signed=False))
+
+def ex_param(x, cfg: ExConfig = ExConfig()) -> np.ndarray:
+    """UQ3.out_frac codes of e^x for signed Q1.in_frac codes x."""
+    return ex_param_stages(x, cfg).result
+
+# ---------------- scoring ----------------
+def csd_terms(c: int) -> list:
+    """(sign, shift) pairs of c in canonical signed-digit form: c = sum(sign << shift)."""
+    c, terms, k = int(c), [], 0
+    sign = -1 if c < 0 else 1
+    c = abs(c)
+    while c:
+        if c & 1:
+            digit = 2 - (c & 3)    # +1 if c = 1 mod 4, -1 if c = 3 mod 4
+            terms.append((sign * digit, k))
+            c -= digit
+        c >>= 1
+        k += 1
+    return terms
+
+def csd_digits(c: int) -> int:
+    """Nonzero digits of c in canonical signed-digit form (adders of a shift-add multiplier + 1)."""
+    return len(csd_terms(c))
+
+def bit_width(values) -> int:
+    """Signed width holding every value."""
+    lo, hi = int(np.min(values)), int(np.max(values))
+    return max(int(lo).bit_length(), int(hi).bit_length()) + 1
+
+def gate_cost(cfg: ExConfig) -> dict:
+    """Full-adder-equivalent cost proxy of each datapath block."""
+    x = input_codes(cfg)
+    in_bits = cfg.in_frac + 2
+    t = (x * cfg.inv_ln2) >> cfg.k_inv
+    n = signext(round_shift(t, cfg.in_frac), cfg.n_bits)
+    r_bits = bit_width(x - n * cfg.ln2)
+    # r << (poly_frac - in_frac) only pads zero LSBs; the multipliers see r's own bits
+    mul_bits = r_bits - max(cfg.in_frac - cfg.poly_frac, 0)
+    poly_bits = cfg.poly_frac + 3
+    shift_stages = int(np.ceil(np.log2(max(2, 1 << cfg.n_bits))))
+    cost = {
+        "inv_ln2_mult": (csd_digits(cfg.inv_ln2) - 1) * (in_bits + cfg.k_inv),
+        "ln2_mult": (csd_digits(cfg.ln2) - 1) * (cfg.n_bits + cfg.in_frac + 1),
+        "round": in_bits + cfg.k_inv,
+        "sub_r": r_bits,
+        "square": mul_bits * mul_bits if cfg.degree >= 2 else 0,
+        "cube": (mul_bits * mul_bits + (csd_digits(round(2 ** cfg.poly_frac / 6)) - 1) * poly_bits)
+                if cfg.degree >= 3 else 0,
+        "poly_add": poly_bits * cfg.degree,
+        "shifter": (poly_bits + (1 << (cfg.n_bits - 1))) * shift_stages,
+    }
+    cost["total"] = sum(cost.values())
+    return cost
+
+def evaluate(cfg: ExConfig) -> dict:
+    """Exhaustive error metrics over every MAC code against exp(x / 2^6), plus the cost proxy."""
+    x6 = mac_codes()
+    y = ex_param(from_mac(x6, cfg), cfg) / 2.0 ** cfg.out_frac
+    ref = np.exp(x6 / 2.0 ** MAC_FRAC)
+    err = np.abs(y - ref)
+    return {
+        "config": cfg._asdict(),
+        "inv_ln2": cfg.inv_ln2,
+        "ln2": cfg.ln2,
+        "max_abs_err": float(err.max()),
+        "mean_abs_err": float(err.mean()),
+        "max_rel_err": float((err / ref).max()),
+        "monotonic_violations": int((np.diff(y) < 0).sum()),
+        "cost": gate_cost(cfg),
+    }
+
+def pareto_front(points) -> list:
+    """Points not dominated in (cost total, max_abs_err), cheapest first."""
+    front, best = [], float("inf")
+    for p in sorted(points, key=lambda p: (p["cost"]["total"], p["max_abs_err"])):
+        if p["max_abs_err"] < best:
+            front.append(p)
+            best = p["max_abs_err"]
+    return front
+
+def default_grid() -> list:
+    axes = {
+        "in_frac":   [4, 5, 6],
+        "k_inv":     list(range(3, 11)),
+        "ln2_adj":   [-1, 0, 1],
+        "n_bits":    [2, 3, 4],
+        "degree":    [1, 2, 3],
+        "poly_frac": [8, 10, 12, 16],
+        "out_frac":  [4, 5, 6, 7],
+    }
+    return [ExConfig(**dict(zip(axes, vals))) for vals in itertools.product(*axes.values())]
+
+def sweep(configs, jobs: int = None) -> list:
+    """Evaluate every configuration over a process pool; one evaluation is far below task overhead, so chunk."""
+    workers = jobs or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(evaluate, configs, chunksize=max(1, len(configs) // (4 * workers))))
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--jobs", type=int, default=None, help="worker processes (default: all cores)")
+    ap.add_argument("--out", default="ex_dse.json", help="all points and the Pareto front, as JSON")
+    args = ap.parse_args()
+
+    configs = default_grid()
+    start = time.monotonic()
+    points = sweep(configs, args.jobs)
+    front = pareto_front(points)
+    wall = time.monotonic() - start
+    with open(args.out, "w") as f:
+        json.dump({"points": points, "pareto": front}, f, indent=1)
+
+    base = evaluate(ExConfig())
+    print(f"{len(points)} configurations in {wall:.1f} s; ex.v today: "
+          f"cost {base['cost']['total']}, max err {base['max_abs_err']:.4f}")
+    print(f"{'cost':>6} {'max_err':>8} {'mean_err':>8}  config")
+    for p in front:
+        print(f"{p['cost']['total']:>6} {p['max_abs_err']:>8.4f} {p['mean_abs_err']:>8.4f}  "
+              + " ".join(f"{k}={v}" for k, v in p["config"].items()))
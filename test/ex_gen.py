@@ -0,0 +1,214 @@
+"""
+Synthesizable ex() Verilog generated from the parameterized model in
+ex_dse.py, plus a one-command equivalence check against that model.
+
+    style   datapath
+    poly    ExConfig range reduction + polynomial; constant multipliers are
+            CSD shift-adds (as in the DSE cost proxy) and every wire is sized
+            from the exact range it takes over the 256 input codes
+    rom     256-entry case table of ex_param()
+
+The module is a drop-in for src/ex.v (8-bit Q1.6 in, 9-bit UQ3.6 out), so
+in_frac and out_frac stay 6. Its first line records the style and the
+configuration, and test_ex_gen.py reads it back to pick the reference table:
+
+    python ex_gen.py emit --style rom --out ex_rom.v
+    python ex_gen.py check --degree 3 --k-inv 7     # generate, then one batched simulation
+    python ex_gen.py check --style rom --make SIM=verilator
+"""
+import argparse
+import hashlib
+import json
+import subprocess
+from pathlib import Path
+
+import numpy as np
+
+from ex_dse import ExConfig, bit_width, csd_terms, ex_param, ex_param_stages
+from ex_model import ex_table
+from fixedpoint import signext
+
+TEST_DIR = Path(__file__).resolve().parent
+GEN_DIR  = TEST_DIR / "sim_build" / "ex_gen"
+HEADER   = "// ex_gen "
+STYLES   = ("poly", "rom")
+IN_BITS, OUT_BITS = 8, 9
+
+def input_codes() -> np.ndarray:
+    """Q1.6 codes in bus order: index i is the signed value of mac_result = i."""
+    return signext(np.arange(1 << IN_BITS), IN_BITS)
+
+def model_table(cfg: ExConfig) -> np.ndarray:
+    """ex_param() response indexed by the unsigned 8-bit code, like ex_model.ex_table()."""
+    return ex_param(input_codes(), cfg)
+
+# ---------------- poly datapath ----------------
+class Netlist:
+    """
+    Signed wires sized from the values they carry. Operands are sign-extended
+    to the expression width first and the result is cast down to its own
+    width, which is exact because the width covers every value.
+    """
+
+    def __init__(self):
+        self.lines = []
+        self.width = {}
+
+    def port(self, name: str, width: int, expr: str):
+        self.lines.append(f"    wire signed [{width - 1}:0] {name} = {expr};")
+        self.width[name] = width
+
+    def ext(self, name: str, width: int) -> str:
+        have = self.width[name]
+        if have >= width:
+            return name
+        wide = f"{name}_{width}"
+        if wide not in self.width:
+            self.port(wide, width, f"{{{{{width - have}{{{name}[{have - 1}]}}}}, {name}}}")
+        return wide
+
+    def wire(self, name: str, values, expr: str, *operands) -> str:
+        """wire name = expr.format(*operands, w=expression width, msb=w - 1)."""
+        width = bit_width(values)
+        op_width = max([width] + [self.width[o] for o in operands])
+        text = expr.format(*(self.ext(o, op_width) for o in operands), w=op_width, msb=op_width - 1)
+        self.port(name, width, text if op_width == width else f"{width}'({text})")
+        return name
+
+def csd_expr(c: int) -> str:
+    """Shift-add form of operand {0} * c."""
+    out = ""
+    for sign, k in sorted(csd_terms(c), key=lambda t: -t[1]):
+        term = f"({{0}} <<< {k})" if k else "{0}"
+        out += ("-" if sign < 0 else "") + term if not out else (" - " if sign < 0 else " + ") + term
+    return out
+
+def shift_expr(s: int) -> str:
+    """Constant shift of operand {0} by 2^s."""
+    return "{0}" if s == 0 else f"{{0}} <<< {s}" if s > 0 else f"{{0}} >>> {-s}"
+
+def poly_body(cfg: ExConfig) -> list:
+    x = input_codes()
+    st = ex_param_stages(x, cfg)
+    p, half = cfg.poly_frac, 1 << (cfg.in_frac - 1)
+    net = Netlist()
+    net.port("x", IN_BITS, "mac_result")
+
+    net.lines.append(f"\n    // ---- n = round(((x * {cfg.inv_ln2}) >>> {cfg.k_inv}) / 2^{cfg.in_frac}), "
+                     f"{cfg.n_bits} bits ----")
+    net.wire("x_inv", x * cfg.inv_ln2, csd_expr(cfg.inv_ln2), "x")
+    net.wire("t", st.t, f"{{0}} >>> {cfg.k_inv}", "x_inv")
+    t_rnd = st.t + np.where(st.t < 0, -half, half)
+    net.wire("t_rnd", t_rnd, f"{{0}} + ({{0}}[{{msb}}] ? -{{w}}'sd{half} : {{w}}'sd{half})", "t")
+    net.wire("n_full", t_rnd >> cfg.in_frac, f"{{0}} >>> {cfg.in_frac}", "t_rnd")
+    full = net.ext("n_full", cfg.n_bits)
+    net.port("n", cfg.n_bits, f"{full}[{cfg.n_bits - 1}:0]")
+    net.lines.append(f"    wire [{cfg.n_bits - 1}:0] n_mag = n[{cfg.n_bits - 1}] ? -n : n;")
+
+    net.lines.append(f"\n    // ---- r = x - n * {cfg.ln2}, then Q0.{p} ----")
+    net.wire("n_ln2", st.n * cfg.ln2, csd_expr(cfg.ln2), "n")
+    net.wire("r", st.r, "{0} - {1}", "x", "n_ln2")
+    net.wire("r_p", st.r_p, shift_expr(p - cfg.in_frac), "r")
+
+    terms = " + r^2/2" * (cfg.degree >= 2) + " + r^3/6" * (cfg.degree >= 3)
+    net.lines.append(f"\n    // ---- e^r ~ 1 + r{terms} in Q0.{p} ----")
+    e = net.wire("e1", (1 << p) + st.r_p, f"{{w}}'sd{1 << p} + {{0}}", "r_p")
+    acc = (1 << p) + st.r_p
+    if cfg.degree >= 2:
+        net.wire("r2_full", st.r_p * st.r_p, "{0} * {1}", "r_p", "r_p")
+        net.wire("r2", st.r2, f"{{0}} >>> {p}", "r2_full")
+        acc = acc + (st.r2 >> 1)
+        e = net.wire("e2", acc, "{0} + ({1} >>> 1)", e, "r2")
+    if cfg.degree >= 3:
+        c6 = int(round(2 ** p / 6))
+        net.wire("r3_full", st.r2 * st.r_p, "{0} * {1}", "r2", "r_p")
+        net.wire("r3", st.r3, f"{{0}} >>> {p}", "r3_full")
+        net.wire("r3_c6", st.r3 * c6, csd_expr(c6), "r3")
+        acc = acc + ((st.r3 * c6) >> p)
+        e = net.wire("e3", acc, f"{{0}} + ({{1}} >>> {p})", e, "r3_c6")
+
+    net.lines.append(f"\n    // ---- 2^n, then Q0.{p} -> UQ3.{cfg.out_frac}, saturated to {OUT_BITS} bits ----")
+    net.wire("e_n", st.e_n,
+             f"n[{cfg.n_bits - 1}] ? ({{0}} >>> n_mag) : ({{0}} <<< n_mag)", e)
+    net.wire("y", st.y, shift_expr(cfg.out_frac - p), "e_n")
+    y = net.ext("y", OUT_BITS + 2)
+    w = max(net.width["y"], OUT_BITS + 2)
+    sat = (1 << OUT_BITS) - 1
+    net.lines.append(f"    assign ex_result = {y}[{w - 1}] ? {OUT_BITS}'d0 : ({y} > {w}'sd{sat}) ? "
+                     f"{OUT_BITS}'h{sat:X} : {y}[{OUT_BITS - 1}:0];")
+    return net.lines
+
+# ---------------- rom ----------------
+def rom_body(cfg: ExConfig) -> list:
+    lines = [f"    reg [{OUT_BITS - 1}:0] rom;", "    always @(*) begin", "        case (mac_result)"]
+    lines += [f"            {IN_BITS}'h{code:02X}: rom = {OUT_BITS}'h{v:03X};"
+              for code, v in enumerate(model_table(cfg).tolist())]
+    lines += ["        endcase", "    end", "    assign ex_result = rom;"]
+    return lines
+
+# ---------------- module text ----------------
+def generate(cfg: ExConfig = ExConfig(), style: str = "poly") -> str:
+    """Verilog source of module ex for cfg."""
+    if style not in STYLES:
+        raise ValueError(f"unknown style {style!r}, expected one of {STYLES}")
+    if (cfg.in_frac, cfg.out_frac) != (6, 6):
+        raise ValueError(f"ex is Q1.6 -> UQ3.6 in project.v; in_frac={cfg.in_frac}, out_frac={cfg.out_frac}")
+    header = json.dumps({"style": style, "config": cfg._asdict()}, sort_keys=True)
+    body = poly_body(cfg) if style == "poly" else rom_body(cfg)
+    return "\n".join([
+        HEADER + header,
+        f"// Generated by test/ex_gen.py ({style}); edit the model, not this file.",
+        "module ex (",
+        f"    input  wire [{IN_BITS - 1}:0] mac_result,  // Q1.6 (signed)",
+        f"    output wire [{OUT_BITS - 1}:0] ex_result    // UQ3.6 (unsigned)",
+        ");",
+        *body,
+        "endmodule",
+    ]) + "\n"
+
+def read_header(path: Path):
+    """(style, ExConfig) of a generated file, None for a hand-written one."""
+    with open(path) as f:
+        first = f.readline()
+    if not first.startswith(HEADER):
+        return None
+    meta = json.loads(first[len(HEADER):])
+    return meta["style"], ExConfig(**meta["config"])
+
+def reference_table(path: Path) -> np.ndarray:
+    """Expected 256-code response of an ex source: its generating model, else ex_model."""
+    meta = read_header(path)
+    return ex_table() if meta is None else model_table(meta[1])
+
+def write(text: str, out: Path = None) -> Path:
+    """Write text to out (default: sim_build/ex_gen/ by content hash); unchanged files keep their mtime."""
+    if out is None:
+        out = GEN_DIR / f"ex_{hashlib.sha256(text.encode()).hexdigest()[:12]}.v"
+    out = Path(out)
+    if not (out.exists() and out.read_text() == text):
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text(text)
+    return out
+
+def check(path: Path, make_vars=()) -> int:
+    """Run the batched equivalence test on path; returns make's exit status."""
+    cmd = ["make", "-C", str(TEST_DIR), f"EX_SRC={Path(path).resolve()}", "EX_BATCH=yes",
+           "COCOTB_TEST_MODULES=test_ex_gen", *make_vars]
+    return subprocess.run(cmd).returncode
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("cmd", choices=["emit", "check"])
+    ap.add_argument("--style", choices=STYLES, default="poly")
+    for field, default in ExConfig._field_defaults.items():
+        ap.add_argument("--" + field.replace("_", "-"), type=int, default=default)
+    ap.add_argument("--out", type=Path, default=None, help="output file (default: sim_build/ex_gen/)")
+    ap.add_argument("--make", action="append", default=[], metavar="VAR=VALUE",
+                    help="extra make variable for check (repeatable)")
+    args = ap.parse_args()
+
+    cfg = ExConfig(**{f: getattr(args, f) for f in ExConfig._fields})
+    path = write(generate(cfg, args.style), args.out)
+    print(path)
+    if args.cmd == "check":
+        raise SystemExit(check(path, args.make))
@@ -0,0 +1,168 @@
+"""
+Vectorized Q-format fixed point for the harness and the reference models.
+
+A QFormat names a two's-complement Qm.n (1 + m + n bits) or unsigned UQm.n
+(m + n bits) layout. Fixed pairs an int64 code array with its format.
+Everything works on whole arrays, and scalars are 0-d arrays:
+
+    x   = Fixed.from_real(pairs_real, Q0_7)       # round to nearest, saturate
+    bus = x.bus                                   # 0..255 for the DUT
+    y   = Fixed(raw9, UQ3_6).real                 # DUT codes -> floats
+    n   = wrap(t >> 6, 3)                         # Verilog 3'(...) on a signed value
+    hi  = bit_slice(mac_div2, 16, 9, signed=True) # mac_div2[16:9] read as signed
+
+Casts between widths either wrap (drop MSBs, like a Verilog assignment) or
+saturate. Right shifts are arithmetic (>>>) on signed formats.
+"""
+from typing import NamedTuple
+
+import numpy as np
+
+# ---------------- raw integer ops ----------------
+def wrap(v, bits: int, signed: bool = True) -> np.ndarray:
+    """Keep the low `bits` of v and read them as signed (two's complement) or unsigned."""
+    v = np.asarray(v, dtype=np.int64)
+    mask = (1 << bits) - 1
+    if not signed:
+        return v & mask
+    s = 1 << (bits - 1)
+    return ((v & mask) ^ s) - s
+
+def signext(v, bits: int) -> np.ndarray:
+    """Wrap integer (or integer array) v to 'bits'-wide signed two's-complement."""
+    return wrap(v, bits, signed=True)
+
+def code_range(bits: int, signed: bool = True):
+    """(min, max) code of a bits-wide field."""
+    return (-(1 << (bits - 1)), (1 << (bits - 1)) - 1) if signed else (0, (1 << bits) - 1)
+
+def saturate(v, bits: int, signed: bool = True) -> np.ndarray:
+    """Clamp v into a bits-wide field (np.minimum/np.maximum: no np.clip dispatch)."""
+    lo, hi = code_range(bits, signed)
+    return np.minimum(np.maximum(np.asarray(v, dtype=np.int64), lo), hi)
+
+def shift(v, s) -> np.ndarray:
+    """v * 2^s with s of either sign (arithmetic right shift for s < 0); s may be an array."""
+    v = np.asarray(v, dtype=np.int64)
+    s = np.asarray(s, dtype=np.int64)
+    return np.where(s >= 0, v << np.maximum(s, 0), v >> np.maximum(-s, 0))
+
+def bit_slice(v, hi: int, lo: int, signed: bool = False) -> np.ndarray:
+    """Verilog v[hi:lo], unsigned unless signed=True (as in $signed(v[hi:lo]))."""
+    return wrap(np.asarray(v, dtype=np.int64) >> lo, hi - lo + 1, signed)
+
+def round_shift(v, s: int) -> np.ndarray:
+    """
+    v / 2^s by the RTL's +/-half-then->>> idiom: half up for v >= 0, but the
+    floor of >>> makes it floor(v / 2^s - 1/2) for v < 0, so negative ties go
+    away from zero and every other negative value lands one below nearest.
+    """
+    v = np.asarray(v, dtype=np.int64)
+    if s <= 0:
+        return v << -s
+    half = 1 << (s - 1)
+    return (v + np.where(v < 0, -half, half)) >> s
+
+# ---------------- formats ----------------
+class QFormat(NamedTuple):
+    int_bits: int
+    frac_bits: int
+    signed: bool = True
+
+    @classmethod
+    def parse(cls, name: str) -> "QFormat":
+        """"Q1.6" or "UQ3.6"."""
+        signed = not name.upper().startswith("U")
+        m, _, n = name.upper().lstrip("U").lstrip("Q").partition(".")
+        return cls(int(m), int(n or 0), signed)
+
+    @property
+    def bits(self) -> int:
+        return self.int_bits + self.frac_bits + int(self.signed)
+
+    @property
+    def lsb(self) -> float:
+        return 2.0 ** -self.frac_bits
+
+    @property
+    def range(self):
+        """(min, max) code."""
+        return code_range(self.bits, self.signed)
+
+    def __str__(self) -> str:
+        return f"{'' if self.signed else 'U'}Q{self.int_bits}.{self.frac_bits}"
+
+Q0_7  = QFormat(0, 7)                  # int8 operands
+Q1_6  = QFormat(1, 6)                  # ex() input (mac_reduced)
+Q1_15 = QFormat(1, 15)                 # mac_div2
+Q2_14 = QFormat(2, 14)                 # mac_reg
+UQ3_6 = QFormat(3, 6, signed=False)    # ex() output, 9 bits
+
+# ---------------- typed arrays ----------------
+class Fixed:
+    """int64 codes in one QFormat; arithmetic on the raw codes stays plain NumPy."""
+    __slots__ = ("raw", "fmt")
+
+    def __init__(self, raw, fmt: QFormat):
+        self.fmt = fmt
+        self.raw = wrap(raw, fmt.bits, fmt.signed)
+
+    @classmethod
+    def from_real(cls, x, fmt: QFormat, overflow: str = "saturate", rounding: str = "nearest") -> "Fixed":
+        """Encode reals: rounding "nearest" (half to even, like np.round) or "floor"; overflow "saturate" or "wrap"."""
+        scaled = np.asarray(x, dtype=np.float64) * (1 << fmt.frac_bits)
+        codes = (np.rint(scaled) if rounding == "nearest" else np.floor(scaled)).astype(np.int64)
+        if overflow == "saturate":
+            codes = saturate(codes, fmt.bits, fmt.signed)
+        return cls(codes, fmt)
+
+    @classmethod
+    def from_bus(cls, bus, fmt: QFormat) -> "Fixed":
+        """Codes from unsigned bus encodings (e.g. 0..255 for an int8 format)."""
+        return cls(bus, fmt)
+
+    @property
+    def real(self) -> np.ndarray:
+        return self.raw * self.fmt.lsb
+
+    @property
+    def bus(self) -> np.ndarray:
+        """Unsigned encoding of the codes, as driven onto or sampled from a port."""
+        return self.raw & ((1 << self.fmt.bits) - 1)
+
+    @property
+    def shape(self):
+        return self.raw.shape
+
+    def __len__(self) -> int:
+        return len(self.raw)
+
+    def __getitem__(self, index) -> "Fixed":
+        return Fixed(self.raw[index], self.fmt)
+
+    def __repr__(self) -> str:
+        return f"Fixed({self.fmt}, {self.raw!r})"
+
+    def cast(self, fmt: QFormat, overflow: str = "wrap") -> "Fixed":
+        """
+        Re-align the binary point (truncating dropped fraction bits, as >>> does)
+        and fit the codes into fmt by wrapping or saturating.
+        """
+        codes = shift(self.raw, fmt.frac_bits - self.fmt.frac_bits)
+        if overflow == "saturate":
+            codes = saturate(codes, fmt.bits, fmt.signed)
+        return Fixed(codes, fmt)
+
+    def __rshift__(self, s) -> "Fixed":
+        """Arithmetic shift of the codes within the same format."""
+        return Fixed(self.raw >> s, self.fmt)
+
+    def __lshift__(self, s) -> "Fixed":
+        """Left shift of the codes, wrapping to the format's width."""
+        return Fixed(self.raw << s, self.fmt)
+
+    def slice(self, hi: int, lo: int, fmt: QFormat) -> "Fixed":
+        """Verilog raw[hi:lo] read in fmt (whose width must be hi - lo + 1)."""
+        if fmt.bits != hi - lo + 1:
+            raise ValueError(f"[{hi}:{lo}] is {hi - lo + 1} bits, {fmt} is {fmt.bits}")
+        return Fixed(bit_slice(self.raw, hi, lo, fmt.signed), fmt)
@@ -0,0 +1,325 @@
+import os
+from typing import NamedTuple
+
+import cocotb
+from cocotb.queue import Queue
+from cocotb.triggers import Event, ReadOnly, RisingEdge, Timer, ValueChange
+from cocotb.utils import get_sim_time
+import numpy as np
+
+from waves import open_window
+
+# uio_in / uio_out bit positions (see project.v I/O mapping)
+VLD_SLV_IN  = 0   # uio_in[0]:  TB -> DUT input valid
+RDY_MST_IN  = 3   # uio_in[3]:  TB -> DUT output ready
+RDY_SLV_OUT = 1   # uio_out[1]: DUT -> TB input ready
+VLD_MST_OUT = 2   # uio_out[2]: DUT -> TB output valid
+EX_HI       = 4   # uio_out[4]: ex_result[8]
+
+def set_bit(val: int, bit: int, one: bool) -> int:
+    return (val | (1 << bit)) if one else (val & ~(1 << bit))
+
+# ---------------- pin interface ----------------
+class TTOutputs(NamedTuple):
+    result: int        # raw 9-bit UQ3.6 {uio_out[4], uo_out}
+    vld_mst_out: int   # uio_out[2]
+    rdy_slv_out: int   # uio_out[1]
+
+class TTPins:
+    """
+    Tiny Tapeout I/O bus with named fields. Handles are looked up once,
+    ui_in/uio_in are written only from Python-side shadows (never read back),
+    drive() coalesces several field updates into at most one write per bus,
+    and sample() decodes every output field from one read of uo_out/uio_out.
+    Create one per test and share it between drivers and monitors.
+    'scope' selects another copy of the bus (a tb.lane[i] block, see
+    lane_pins); the clock always comes from the testbench top.
+    """
+
+    def __init__(self, dut, scope=None):
+        self.dut = dut
+        self.scope = dut if scope is None else scope
+        self.clk = dut.clk
+        self._ui_in = self.scope.ui_in
+        self._uio_in = self.scope.uio_in
+        self._uo_out = self.scope.uo_out
+        self._uio_out = self.scope.uio_out
+        self._ui = 0
+        self._uio = 0
+        self._ui_in.value = 0
+        self._uio_in.value = 0
+
+    def drive(self, data=None, vld_slv_in=None, rdy_mst_in=None):
+        """Update any subset of input fields; each bus is written once, and only if it changed."""
+        if data is not None and (data & 0xFF) != self._ui:
+            self._ui = data & 0xFF
+            self._ui_in.value = self._ui
+        uio = self._uio
+        if vld_slv_in is not None:
+            uio = set_bit(uio, VLD_SLV_IN, vld_slv_in)
+        if rdy_mst_in is not None:
+            uio = set_bit(uio, RDY_MST_IN, rdy_mst_in)
+        if uio != self._uio:
+            self._uio = uio
+            self._uio_in.value = uio
+
+    @property
+    def data(self) -> int:
+        return self._ui
+
+    @data.setter
+    def data(self, val: int):
+        self.drive(data=val)
+
+    @property
+    def vld_slv_in(self) -> int:
+        return (self._uio >> VLD_SLV_IN) & 1
+
+    @vld_slv_in.setter
+    def vld_slv_in(self, one):
+        self.drive(vld_slv_in=one)
+
+    @property
+    def rdy_mst_in(self) -> int:
+        return (self._uio >> RDY_MST_IN) & 1
+
+    @rdy_mst_in.setter
+    def rdy_mst_in(self, one):
+        self.drive(rdy_mst_in=one)
+
+    def sample(self) -> TTOutputs:
+        uio = int(self._uio_out.value)
+        return TTOutputs((((uio >> EX_HI) & 1) << 8) | (int(self._uo_out.value) & 0xFF),
+                         (uio >> VLD_MST_OUT) & 1,
+                         (uio >> RDY_SLV_OUT) & 1)
+
+def lane_count() -> int:
+    """Extra top-level copies in this build (make INSTANCES=N, 0 if not set)."""
+    return int(os.environ.get("TB_INSTANCES") or 0)
+
+def lane_pins(dut) -> list:
+    """One TTPins per tb.lane[i] copy; create them before reset() so their inputs start cleared."""
+    return [TTPins(dut, dut.lane[i]) for i in range(lane_count())]
+
+async def reset(dut, cycles=5) -> TTPins:
+    pins = TTPins(dut)  # inputs start from zeroed shadows: vld/rdy cleared
+    open_window(dut)    # make WAVES_WINDOW=...: capture the configured sim-time window
+    dut.rst_n.value = 0
+    await Timer(1, "ns")
+    for _ in range(cycles):
+        await RisingEdge(dut.clk)
+    dut.rst_n.value = 1
+    for _ in range(cycles):
+        await RisingEdge(dut.clk)
+    return pins
+
+# ---------------- input side ----------------
+class StreamDriver:
+    """
+    Queue-fed input stream for tt_um_attention_top.
+    Beats go out one per cycle with vld held high across terms and dots,
+    each beat waits for rdy (uio_out[1]). vld and data are driven
+    through the shared TTPins shadows. With gap_prob > 0, random idle
+    cycles (vld=0) are inserted before beats. With record_times, the sim
+    time (ns) of the edge that takes each dot's 8th beat goes to dot_times.
+    """
+
+    def __init__(self, pins: TTPins, gap_prob: float = 0.0, seed: int = 0,
+                 record_times: bool = False):
+        self.pins = pins
+        self.gap_prob = gap_prob
+        self.rng = np.random.default_rng(seed)
+        self.queue = Queue()
+        self.beats_sent = 0
+        self.stall_cycles = 0   # cycles with vld=1 but rdy_slv_out=0
+        self.dot_times = [] if record_times else None
+        self._idle = Event()
+        self._idle.set()
+        self._task = cocotb.start_soon(self._run())
+
+    def send(self, pairs):
+        """Queue one dot (4, 2) or a batch of dots (N, 4, 2) of Q0.7 codes, A then B per term."""
+        beats = (np.asarray(pairs, dtype=np.int64).reshape(-1) & 0xFF).tolist()
+        self._idle.clear()
+        self.queue.put_nowait(beats)
+
+    async def wait_idle(self):
+        """Return once every queued beat has been accepted by the DUT."""
+        await self._idle.wait()
+
+    def stop(self):
+        self._task.cancel()
+
+    async def _run(self):
+        pins = self.pins
+        clk = pins.clk
+        while True:
+            if self.queue.empty():
+                pins.vld_slv_in = 0
+                self._idle.set()
+            beats = await self.queue.get()
+
+            # draw all gap decisions for this batch up front
+            gaps = (self.rng.random(len(beats)) < self.gap_prob).tolist() \
+                if self.gap_prob > 0 else None
+
+            for idx, beat in enumerate(beats):
+                if gaps is not None:
+                    while gaps[idx]:
+                        pins.vld_slv_in = 0
+                        await RisingEdge(clk)
+                        gaps[idx] = self.rng.random() < self.gap_prob
+
+                pins.drive(data=beat, vld_slv_in=1)
+
+                # honour rdy_slv_out: the beat is taken on the first edge with rdy=1
+                await ReadOnly()
+                while not pins.sample().rdy_slv_out:
+                    self.stall_cycles += 1
+                    await RisingEdge(clk)
+                    await ReadOnly()
+                await RisingEdge(clk)
+                self.beats_sent += 1
+                if self.dot_times is not None and self.beats_sent % 8 == 0:
+                    self.dot_times.append(get_sim_time("ns"))
+
+# ---------------- output side ----------------
+class OutputMonitor:
+    """
+    Background monitor of the output handshake. Pushes the raw 9-bit result
+    ({uio_out[4], uo_out}) into 'queue' for every cycle that ends in
+    vld_mst_out && rdy_mst_in. While valid is low it sleeps on uio_out
+    changes instead of waking every clock. With record_times, the sim time
+    (ns) of the cycle each result is taken in goes to times, the time of
+    the first valid cycle of every result put on the bus goes to
+    valid_times, and offers holds, per result taken, the index of its
+    valid_times entry. A new result is one that raises vld_mst_out, follows
+    a handshake with vld still high, or replaces a held result with a
+    different value; an overwrite by an equal value is invisible at the pins.
+    """
+
+    total = 0   # results seen by all monitors in this process (read by profiling.py)
+
+    def __init__(self, pins: TTPins, record_times: bool = False):
+        self.pins = pins
+        self.queue = Queue()
+        self.count = 0
+        self.times = [] if record_times else None
+        self.valid_times = [] if record_times else None
+        self.offers = [] if record_times else None
+        self._task = cocotb.start_soon(self._run())
+
+    async def collect(self, n: int) -> np.ndarray:
+        """Wait for the next n results, return them as one array."""
+        return np.array([await self.queue.get() for _ in range(n)], dtype=np.int64)
+
+    def stop(self):
+        self._task.cancel()
+
+    async def _run(self):
+        pins = self.pins
+        clk = pins.clk
+        fresh, held = True, None   # next valid cycle shows a new result / value on the bus
+        while True:
+            await ReadOnly()
+            out = pins.sample()
+            if not out.vld_mst_out:
+                fresh = True
+                await ValueChange(pins.scope.uio_out)
+                continue
+            if self.valid_times is not None and (fresh or out.result != held):
+                self.valid_times.append(get_sim_time("ns"))
+            held, fresh = out.result, bool(pins.rdy_mst_in)
+            if pins.rdy_mst_in:
+                self.queue.put_nowait(out.result)
+                self.count += 1
+                OutputMonitor.total += 1
+                if self.times is not None:
+                    self.times.append(get_sim_time("ns"))
+                    self.offers.append(len(self.valid_times) - 1)
+            await RisingEdge(clk)
+
+class SinkReady:
+    """
+    Drives rdy_mst_in once per cycle from a backpressure pattern:
+    "always", "never", "random:<p>" (ready with probability p) or
+    "every:<k>" (ready one cycle in k).
+    """
+
+    def __init__(self, pins: TTPins, pattern: str = "always", seed: int = 0):
+        self.pins = pins
+        self.pattern = pattern
+        kind, _, arg = pattern.partition(":")
+        if kind not in ("always", "never", "random", "every"):
+            raise ValueError(f"unknown ready pattern {pattern!r}")
+        self._kind = kind
+        self._arg = float(arg) if arg else 0.0
+        self.rng = np.random.default_rng(seed)
+        if kind in ("always", "never"):
+            pins.rdy_mst_in = int(kind == "always")
+            self._task = None
+        else:
+            self._task = cocotb.start_soon(self._run())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+
+    async def _run(self):
+        pins = self.pins
+        cycle = 0
+        while True:
+            if self._kind == "random":
+                pins.rdy_mst_in = int(self.rng.random() < self._arg)
+            else:
+                pins.rdy_mst_in = int(cycle % int(self._arg) == 0)
+            cycle += 1
+            await RisingEdge(pins.clk)
+
+class Scoreboard:
+    """Bulk comparison of collected raw results against a precomputed expected array."""
+
+    def __init__(self, expected, x_q16=None):
+        self.expected = np.asarray(expected, dtype=np.int64)
+        self.x_q16 = None if x_q16 is None else np.asarray(x_q16, dtype=np.int64)
+
+    def mismatches(self, got) -> np.ndarray:
+        """Indices where got != expected (a length mismatch counts from the shorter end)."""
+        got = np.asarray(got, dtype=np.int64)
+        n = min(len(got), len(self.expected))
+        bad = np.flatnonzero(got[:n] != self.expected[:n])
+        return np.concatenate([bad, np.arange(n, max(len(got), len(self.expected)))])
+
+    def report(self, got, limit: int = 20) -> str:
+        got = np.asarray(got, dtype=np.int64)
+        bad = self.mismatches(got)
+        lines = [f"{bad.size} mismatches in {len(self.expected)} expected / {len(got)} received"]
+        for i in bad[:limit]:
+            g = f"0x{got[i]:03X}" if i < len(got) else "missing"
+            e = f"0x{self.expected[i]:03X}" if i < len(self.expected) else "unexpected"
+            x = f"  x_q16={self.x_q16[i]}" if self.x_q16 is not None and i < len(self.x_q16) else ""
+            lines.append(f"  #{i}: dut={g} model={e}{x}")
+        if bad.size > limit:
+            lines.append(f"  ... {bad.size - limit} more")
+        return "\n".join(lines)
+
+    def summary(self, got, stimulus=None, limit: int = 1000) -> dict:
+        """JSON-ready mismatch record; 'stimulus' is the (N, 4, 2) input array."""
+        got = np.asarray(got, dtype=np.int64)
+        bad = self.mismatches(got)
+        records = []
+        for i in bad[:limit].tolist():
+            rec = {"index": i,
+                   "dut": int(got[i]) if i < len(got) else None,
+                   "model": int(self.expected[i]) if i < len(self.expected) else None}
+            if self.x_q16 is not None and i < len(self.x_q16):
+                rec["x_q16"] = int(self.x_q16[i])
+            if stimulus is not None and i < len(stimulus):
+                rec["pairs"] = np.asarray(stimulus[i]).tolist()
+            records.append(rec)
+        return {"expected": len(self.expected), "received": len(got),
+                "mismatches": int(bad.size), "records": records}
+
+    def check(self, got):
+        """Assert that every result matches, reporting all mismatches at once."""
+        assert self.mismatches(got).size == 0, self.report(got)
@@ -0,0 +1,30 @@
+from typing import NamedTuple
+
+import numpy as np
+
+from fixedpoint import bit_slice, signext
+
+# ---------------- vectorized RTL model of the MAC path in project.v ----------------
+class MacPath(NamedTuple):
+    mac_sum: np.ndarray      # exact sum of the 4 int8*int8 products
+    mac_reg: np.ndarray      # 17-bit signed accumulator (Q2.14), wrapped like the reg
+    mac_div2: np.ndarray     # arithmetic >>>1 (Q1.15)
+    mac_reduced: np.ndarray  # mac_div2[16:9] as int8 (Q1.6), what ex() sees
+
+def mac_path_batch(pairs) -> MacPath:
+    """
+    Emulate the RTL MAC path for a batch of dots in one pass.
+    Input:  pairs of shape (N, 4, 2) (or (4, 2) for a single dot), int8 Q0.7 codes;
+            unsigned 0..255 bus encodings are accepted as well.
+    Output: MacPath of int64 arrays with shape (N,) (or scalars for a single dot).
+    """
+    q = signext(pairs, 8)
+    return mac_reduce((q[..., 0] * q[..., 1]).sum(axis=-1))
+
+def mac_reduce(mac_sum) -> MacPath:
+    """The register/shift/slice half of the path, from exact sums of products (any shape)."""
+    mac_sum = np.asarray(mac_sum, dtype=np.int64)
+    mac_reg = signext(mac_sum, 17)
+    mac_div2 = mac_reg >> 1
+    mac_reduced = bit_slice(mac_div2, 16, 9, signed=True)
+    return MacPath(mac_sum, mac_reg, mac_div2, mac_reduced)
@@ -0,0 +1,121 @@
+"""
+Opt-in per-test profiling for the cocotb tests (make PROFILE=yes, or TB_PROFILE=1).
+
+For every test wrapped with @profiled this writes, under TB_PROFILE_DIR (default profile/):
+  <module>.<test>.pstat  cProfile output of the Python side of the test
+  <module>.<test>.json   wall time, sim time, clock cycles, dots and dots per wall-second
+and logs the TB_PROFILE_TOP (default 15) hottest frames by own time.
+
+Every record is compared against TB_PROFILE_BASELINE (default the committed
+profile_baseline.json next to this file) on cycle-normalized metrics:
+  dots per cycle     deterministic for a given test; fails if it drops by more
+                     than TB_PROFILE_DOTS_TOL (default 0)
+  wall us per cycle  harness cost, reported as baseline_ratio; gated only when
+                     TB_PROFILE_TOL is set (e.g. 0.25 = 25% slower fails) and
+                     the baseline was recorded on the same host and simulator.
+                     It does not carry across machines, and back-to-back runs
+                     on one machine already spread by 1.5x.
+Tests shorter than MIN_CYCLES are recorded but not compared, and tests without
+a baseline entry are reported as such. A missing baseline file fails the test.
+TB_PROFILE_UPDATE=1 records the current run as the new baseline instead.
+"""
+import cProfile
+import functools
+import io
+import json
+import os
+import platform
+import pstats
+import time
+from pathlib import Path
+
+import cocotb
+from cocotb.utils import get_sim_time
+
+from harness import OutputMonitor
+
+ENABLED      = os.environ.get("TB_PROFILE", "0") == "1"
+PROFILE_DIR  = Path(os.environ.get("TB_PROFILE_DIR", "profile"))
+TOP_N        = int(os.environ.get("TB_PROFILE_TOP", "15"))
+BASELINE     = Path(os.environ.get("TB_PROFILE_BASELINE", Path(__file__).resolve().parent / "profile_baseline.json"))
+TOLERANCE    = float(os.environ["TB_PROFILE_TOL"]) if os.environ.get("TB_PROFILE_TOL") else None
+DOTS_TOL     = float(os.environ.get("TB_PROFILE_DOTS_TOL", "0.0"))
+UPDATE       = os.environ.get("TB_PROFILE_UPDATE", "0") == "1"
+CLK_NS       = 10   # every test runs a 10 ns clock
+MIN_CYCLES   = 1000
+
+def hot_frames(prof: cProfile.Profile, top: int = TOP_N) -> str:
+    buf = io.StringIO()
+    pstats.Stats(prof, stream=buf).sort_stats("tottime").print_stats(top)
+    return buf.getvalue()
+
+BASELINE_FIELDS = ("host", "sim", "cycles", "dots", "dots_per_cycle", "wall_us_per_cycle")
+
+def check_baseline(name: str, record: dict) -> str:
+    """Compare against the stored baseline (or update it); returns a failure message or ''."""
+    if UPDATE:
+        base = json.loads(BASELINE.read_text()) if BASELINE.exists() else {}
+        base[name] = {k: record[k] for k in BASELINE_FIELDS}
+        BASELINE.parent.mkdir(parents=True, exist_ok=True)
+        BASELINE.write_text(json.dumps(base, indent=1, sort_keys=True) + "\n")
+        return ""
+    if not BASELINE.exists():
+        return f"no profile baseline at {BASELINE}; set TB_PROFILE_BASELINE or record one with TB_PROFILE_UPDATE=1"
+    ref = json.loads(BASELINE.read_text()).get(name)
+    if not ref:
+        record["baseline_ratio"] = "no entry"
+        return ""
+    if record["cycles"] < MIN_CYCLES:
+        return ""
+    if record["dots_per_cycle"] < ref["dots_per_cycle"] * (1.0 - DOTS_TOL) - 1e-9:
+        return (f"dots per cycle dropped: {record['dots_per_cycle']:.4f} vs baseline "
+                f"{ref['dots_per_cycle']:.4f} (tolerance {DOTS_TOL:.0%})")
+    ratio = record["wall_us_per_cycle"] / ref["wall_us_per_cycle"]
+    record["baseline_ratio"] = round(ratio, 3)
+    same_machine = (ref["host"], ref["sim"]) == (record["host"], record["sim"])
+    if TOLERANCE is not None and same_machine and ratio > 1.0 + TOLERANCE:
+        return (f"harness slowed down: {record['wall_us_per_cycle']:.2f} us/cycle vs baseline "
+                f"{ref['wall_us_per_cycle']:.2f} ({ratio:.2f}x > {1.0 + TOLERANCE:.2f}x)")
+    return ""
+
+def profiled(test_fn):
+    """Wrap a cocotb test coroutine; a no-op unless profiling is enabled."""
+    if not ENABLED:
+        return test_fn
+
+    @functools.wraps(test_fn)
+    async def wrapper(dut, *args, **kwargs):
+        name = f"{test_fn.__module__}.{test_fn.__name__}"
+        prof = cProfile.Profile()
+        dots0 = OutputMonitor.total
+        sim0 = get_sim_time("ns")
+        wall0 = time.perf_counter()
+        prof.enable()
+        try:
+            await test_fn(dut, *args, **kwargs)
+        finally:
+            prof.disable()
+            wall = time.perf_counter() - wall0
+            sim_ns = get_sim_time("ns") - sim0
+            cycles = int(sim_ns // CLK_NS)
+            dots = OutputMonitor.total - dots0
+            record = {
+                "test": name,
+                "host": platform.node(),
+                "sim": cocotb.SIM_NAME,
+                "wall_s": round(wall, 6),
+                "sim_time_ns": sim_ns,
+                "cycles": cycles,
+                "dots": dots,
+                "dots_per_wall_s": round(dots / wall, 1) if wall > 0 else 0.0,
+                "dots_per_cycle": round(dots / cycles, 6) if cycles else 0.0,
+                "wall_us_per_cycle": round(1e6 * wall / cycles, 3) if cycles else 0.0,
+            }
+            PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+            prof.dump_stats(PROFILE_DIR / f"{name}.pstat")
+            slow = check_baseline(name, record)
+            (PROFILE_DIR / f"{name}.json").write_text(json.dumps(record, indent=1))
+            dut._log.info(f"profile {name}: {json.dumps(record)}\n{hot_frames(prof)}")
+        assert not slow, slow
+
+    return wrapper
@@ -0,0 +1,185 @@
+"""
+Bit-exact model of the softmax reciprocal (README "Sum + reciprocal without
+LUT"), exhaustive verification, and the .mem table generator.
+
+    s  = msb(Z) - 15                       leading-one normalize: Z1 = Z * 2^-s in [0.5, 1)
+    R0 = C - ((D * Z1) >> 16)              linear seed 48/17 - 32/17 * Z1
+    T  = (Z1 * R0) >> 16
+    R1 = (R0 * ((2 << 16) - T)) >> 16      Newton step, NEWTON_STEPS times (one)
+    R  = R1 >> s   (R1 << -s for s < 0)    1/Z in Q0.16
+
+Z is the row sum of four UQ3.6 exponentials, so every possible Z is one of
+the Z_BITS-wide UQ5.6 codes; verify() checks all of them in one pass.
+
+    python recip_model.py              # verify, then write src/exp_lut.mem and src/recip_lut.mem
+    python recip_model.py --force      # rewrite even if the parameter hash is unchanged
+
+Each .mem file starts with a "// params <hash>" comment. The hash covers the
+generation parameters (seed constants, Newton steps, formats, table sizes)
+and the table contents, so edits to the model sources that leave the tables
+alone do not rewrite them. Generation is skipped while the hash in the
+existing files matches.
+"""
+import argparse
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+
+from ex_model import ex_table
+from fixedpoint import shift
+
+RECIP_C_Q16 = 185043   # round(48/17 * 2^16)
+RECIP_D_Q16 = 123362   # round(32/17 * 2^16)
+Z_FRAC      = 6        # Z is UQ5.6: the sum of four UQ3.6 exponentials
+Z_BITS      = 11       # 4 * 0x1FF = 2044 < 2^11
+NEWTON_STEPS = 1
+NEWTON_REL_BOUND = (1 / 17) ** (2 ** NEWTON_STEPS) + 2.0 ** -14
+EXP_FMT     = (3, 6)         # ex() codes: UQ3.6, 9 bits
+RECIP_FMT   = (Z_FRAC, 16)   # 1/Z <= 2^Z_FRAC at Z = one LSB, and R lands just below it: UQ6.16, 22 bits
+SRC_DIR     = Path(__file__).resolve().parent.parent / "src"
+
+# ---------------- model ----------------
+class RecipStages(NamedTuple):
+    s: np.ndarray     # normalization shift, Z1 = Z * 2^-s
+    z1: np.ndarray    # normalized Z in [2^15, 2^16), Q0.16
+    r0: np.ndarray    # linear seed, Q0.16
+    t: np.ndarray     # Z1 * R0, Q0.16
+    r1: np.ndarray    # after NEWTON_STEPS Newton steps, Q0.16 (1/Z1)
+    r: np.ndarray     # 1/Z, Q0.16
+
+def recip_stages(z_q16) -> RecipStages:
+    """Every stage of the reciprocal for positive Z in Q0.16 (zero is treated as one LSB)."""
+    z = np.maximum(np.asarray(z_q16, dtype=np.int64), 1)
+    msb = np.frexp(z.astype(np.float64))[1] - 1            # leading-one position
+    s = msb - 15                                            # Z1 = Z * 2^-s in [2^15, 2^16)
+    z1 = shift(z, -s)
+
+    r0 = RECIP_C_Q16 - ((RECIP_D_Q16 * z1) >> 16)
+    r1 = r0
+    for _ in range(NEWTON_STEPS):
+        t  = (z1 * r1) >> 16
+        r1 = (r1 * ((2 << 16) - t)) >> 16
+    r  = shift(r1, -s)
+    return RecipStages(s, z1, r0, t, r1, r)
+
+def recip_newton_q16(z_q16):
+    """1/Z in Q0.16 for positive Z in Q0.16."""
+    return recip_stages(z_q16).r
+
+# ---------------- exhaustive verification ----------------
+def z_domain() -> np.ndarray:
+    """Every nonzero row sum Z as a UQ5.6 code."""
+    return np.arange(1, 1 << Z_BITS)
+
+def verify() -> dict:
+    """
+    Check every Z in one pass: each Newton step squares the seed's 1/17
+    relative error, so 1/Z1 must stay within (1/17)^(2^NEWTON_STEPS) plus the
+    Q0.16 truncations (NEWTON_REL_BOUND, about 8 bits), and 1/Z must be
+    monotonically non-increasing. Returns the error summary; raises
+    AssertionError on a violation.
+    """
+    z = z_domain() << (16 - Z_FRAC)
+    st = recip_stages(z)
+    exact_z1 = 2.0 ** 32 / st.z1                              # 1/Z1 in Q0.16
+    rel_z1 = np.abs(st.r1 - exact_z1) / exact_z1
+    exact = 2.0 ** 32 / z
+    abs_lsb = np.abs(st.r - exact)
+    seed_rel = np.abs(st.r0 - exact_z1) / exact_z1
+
+    summary = {
+        "codes": int(z.size),
+        "seed_rel_err_max": float(seed_rel.max()),
+        "newton_rel_err_max": float(rel_z1.max()),
+        "newton_bits": float(-np.log2(rel_z1.max())),
+        "recip_abs_err_lsb_max": float(abs_lsb.max()),
+        "shift_range": [int(st.s.min()), int(st.s.max())],
+    }
+    bad = np.flatnonzero(rel_z1 > NEWTON_REL_BOUND)
+    assert bad.size == 0, f"Newton step above its error bound at Z codes {z_domain()[bad[:16]].tolist()}"
+    rising = np.flatnonzero(np.diff(st.r) > 0)
+    assert rising.size == 0, f"1/Z not monotonic at Z codes {z_domain()[rising[:16]].tolist()}"
+    return summary
+
+# ---------------- .mem generation ----------------
+def params_hash(tables: dict = None) -> str:
+    """Hash of the generation parameters and the contents of the tables (default: mem_tables())."""
+    tables = mem_tables() if tables is None else tables
+    params = [RECIP_C_Q16, RECIP_D_Q16, NEWTON_STEPS, Z_FRAC, Z_BITS,
+              {name: [fmt, len(values)] for name, (values, fmt, _) in sorted(tables.items())}]
+    h = hashlib.sha256(json.dumps(params).encode())
+    for name in sorted(tables):
+        h.update(np.asarray(tables[name][0], dtype="<i8").tobytes())
+    return h.hexdigest()[:16]
+
+def fmt_name(fmt) -> str:
+    return f"UQ{fmt[0]}.{fmt[1]}"
+
+def mem_text(values, digest: str, comment: str, fmt) -> str:
+    """One hex word per entry, zero-padded to the width of the unsigned format fmt = (int bits, frac bits)."""
+    values = np.asarray(values, dtype=np.int64)
+    bits = sum(fmt)
+    over = np.flatnonzero((values < 0) | (values >> bits != 0))
+    if over.size:
+        raise ValueError(f"entries {over[:16].tolist()} do not fit {fmt_name(fmt)} ({bits} bits)")
+    width = (bits + 3) // 4
+    lines = [f"// params {digest}", f"// {comment}"]
+    lines += [f"{v:0{width}x}" for v in values.tolist()]
+    return "\n".join(lines) + "\n"
+
+MEM_FILES = ("exp_lut.mem", "recip_lut.mem")
+
+def mem_tables() -> dict:
+    """File name (MEM_FILES) -> (values, format, description)."""
+    recip = np.concatenate([[0], recip_newton_q16(z_domain() << (16 - Z_FRAC))])
+    return {
+        "exp_lut.mem": (ex_table(), EXP_FMT,
+                        f"ex(): 256 x {sum(EXP_FMT)}b {fmt_name(EXP_FMT)}, indexed by the Q1.6 code as unsigned"),
+        "recip_lut.mem": (recip, RECIP_FMT,
+                          f"1/Z: {1 << Z_BITS} x {sum(RECIP_FMT)}b {fmt_name(RECIP_FMT)}, "
+                          f"indexed by the UQ5.6 row sum Z (Z=0 -> 0)"),
+    }
+
+def cached_hash(path: Path) -> str:
+    try:
+        with open(path) as f:
+            first = f.readline().split()
+    except FileNotFoundError:
+        return ""
+    return first[2] if first[:2] == ["//", "params"] and len(first) > 2 else ""
+
+def generate_mem(out_dir: Path = SRC_DIR, force: bool = False) -> list:
+    """Verify and write the .mem tables unless their parameter hash is unchanged; returns the files written."""
+    tables = mem_tables()
+    digest = params_hash(tables)
+    stale = [name for name in MEM_FILES if force or cached_hash(out_dir / name) != digest]
+    if not stale:
+        return []
+    verify()
+    out_dir.mkdir(parents=True, exist_ok=True)
+    for name in stale:
+        values, fmt, comment = tables[name]
+        fd, tmp = tempfile.mkstemp(prefix=name + ".", suffix=".tmp", dir=out_dir)   # private per writer
+        with os.fdopen(fd, "w") as f:
+            f.write(mem_text(values, digest, comment, fmt))
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, out_dir / name)
+    return [out_dir / name for name in stale]
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--out", type=Path, default=SRC_DIR, help="directory for the .mem files")
+    ap.add_argument("--force", action="store_true", help="regenerate even if the hash matches")
+    ap.add_argument("--verify-only", action="store_true")
+    args = ap.parse_args()
+    if args.verify_only:
+        for key, val in verify().items():
+            print(f"{key:>22}: {val}")
+    else:
+        written = generate_mem(args.out, args.force)
+        print("\n".join(f"wrote {p}" for p in written) or f"tables up to date ({params_hash()})")
@@ -0,0 +1,205 @@
+"""
+Offline reports from the raw results the simulations leave behind. Nothing
+here runs inside the simulator, and matplotlib is only imported when a plot
+is actually redrawn.
+
+    result set   raw input                              outputs
+    ex_error     ex_sweep.tvec (test_exp.py)            ex_error.png, ex_error_square.png, reports/ex_error.md
+    coverage     sim_build/shards/*/mismatches.json     reports/coverage.md
+                 (run_regression.py)
+    profile      profile/*.json (make PROFILE=yes)      reports/profile.md
+    bench        bench_results.json (test_bench.py)     reports/bench.md
+    attention    attention_results.json                 reports/attention.md
+                 (test_attention.py)
+
+Every result set is rebuilt only when the content hash of its inputs
+changed since the last build (recorded in reports/manifest.json) or one of
+its outputs is missing. Result sets without inputs are skipped:
+
+    python report.py                 # everything that changed
+    python report.py ex_error --force
+    make report
+"""
+import argparse
+import hashlib
+import json
+from pathlib import Path
+
+import numpy as np
+
+from ex_coverage import coverage_goals
+from vector_store import VectorStore
+
+TEST_DIR   = Path(__file__).resolve().parent
+REPORT_DIR = TEST_DIR / "reports"
+MANIFEST   = REPORT_DIR / "manifest.json"
+ERR_BIN    = 0.25   # x-bin width of the ex() error table
+
+def md_table(header, rows) -> str:
+    lines = ["| " + " | ".join(header) + " |", "|" + "---|" * len(header)]
+    lines += ["| " + " | ".join(str(c) for c in row) + " |" for row in rows]
+    return "\n".join(lines) + "\n"
+
+# ---------------- ex() error vs exp(x) ----------------
+def ex_error_inputs() -> list:
+    return [p for p in [TEST_DIR / "ex_sweep.tvec"] if p.exists()]
+
+def plot_error(path: Path, x, y, label: str, ylabel: str):
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots()
+    ax.plot(x, y, label=label)
+    ax.legend(); ax.set_xlabel("x"); ax.set_ylabel(ylabel); ax.grid(True)
+    fig.savefig(path, dpi=150)
+    plt.close(fig)
+
+def build_ex_error(inputs) -> list:
+    store = VectorStore(inputs[0])
+    meta = store.meta
+    x = meta["x_start"] + meta["x_step"] * np.arange(len(store))
+    ref = np.exp(x)
+    y = np.asarray(store.outputs, dtype=np.int64) / 2.0 ** meta["out_frac"]
+    err = np.abs(y - ref)
+
+    outputs = [TEST_DIR / "ex_error.png", TEST_DIR / "ex_error_square.png", REPORT_DIR / "ex_error.md"]
+    plot_error(outputs[0], x, err, "|approx - exp(x)|", "error")
+    plot_error(outputs[1], x, err ** 2, "(approx - exp(x))^2", "squared error")
+
+    edges = np.arange(x[0], x[-1] + ERR_BIN, ERR_BIN)
+    idx = np.minimum(((x - x[0]) / ERR_BIN).astype(np.int64), len(edges) - 2)
+    rows = []
+    for b in range(len(edges) - 1):
+        e, r = err[idx == b], (err / ref)[idx == b]
+        if e.size:
+            rows.append([f"[{edges[b]:+.2f}, {edges[b + 1]:+.2f})", f"{e.max():.4f}", f"{e.mean():.4f}",
+                         f"{np.sqrt(np.mean(e ** 2)):.4f}", f"{100 * r.max():.2f}"])
+    rows.append(["all", f"{err.max():.4f}", f"{err.mean():.4f}", f"{np.sqrt(np.mean(err ** 2)):.4f}",
+                 f"{100 * (err / ref).max():.2f}"])
+    text = (f"# ex() error vs exp(x)\n\n{len(store)} grid points from {inputs[0].name} "
+            f"(rtl {meta.get('rtl_hash', '?')}), UQ3.{meta['out_frac']} output.\n\n"
+            + md_table(["x", "max abs", "mean abs", "rms", "max rel %"], rows))
+    outputs[2].write_text(text)
+    return outputs
+
+# ---------------- regression coverage ----------------
+def coverage_inputs() -> list:
+    return sorted((TEST_DIR / "sim_build" / "shards").glob("*/mismatches.json"))
+
+def build_coverage(inputs) -> list:
+    """Union of the shards' ex() coverage: a bin is hit if any shard hit it."""
+    reports = [json.loads(p.read_text()) for p in inputs]
+    reports = [r for r in reports if "coverage" in r]
+    goals = coverage_goals()
+    rows = []
+    for name, goal in goals.items():
+        missing = None
+        for rep in reports:
+            miss = {tuple(m) if isinstance(m, list) else m for m in rep["coverage"][name]["missing"]}
+            missing = miss if missing is None else missing & miss
+        missing = goal if missing is None else missing
+        hit = len(goal) - len(missing)
+        rows.append([name, hit, len(goal), f"{100.0 * hit / len(goal):.1f}",
+                     ", ".join(map(str, sorted(missing)[:8])) + (" ..." if len(missing) > 8 else "")])
+    mism = sum(r.get("mismatches", 0) for r in reports)
+    dots = sum(r.get("expected", 0) for r in reports)
+    out = REPORT_DIR / "coverage.md"
+    out.write_text(f"# Regression coverage\n\n{len(reports)} shards, {dots} dots, {mism} mismatches.\n\n"
+                   + md_table(["bin", "hit", "goal", "%", "missing"], rows))
+    return [out]
+
+# ---------------- testbench profile ----------------
+def profile_inputs() -> list:
+    return sorted((TEST_DIR / "profile").glob("*.json"))
+
+def build_profile(inputs) -> list:
+    records = sorted((json.loads(p.read_text()) for p in inputs), key=lambda r: -r["wall_s"])
+    rows = [[r["test"], f"{r['wall_s']:.3f}", r["cycles"], r["dots"], r["dots_per_wall_s"],
+             r.get("dots_per_cycle", ""), r["wall_us_per_cycle"], r.get("baseline_ratio", "")] for r in records]
+    out = REPORT_DIR / "profile.md"
+    out.write_text("# Testbench profile\n\n" + md_table(
+        ["test", "wall s", "cycles", "dots", "dots/s", "dots/cycle", "us/cycle", "vs baseline"], rows))
+    return [out]
+
+# ---------------- throughput benchmark ----------------
+def bench_inputs() -> list:
+    return [p for p in [TEST_DIR / "bench_results.json"] if p.exists()]
+
+def lat_cell(lat) -> str:
+    return f"{lat['min']} / {lat['mean']:.2f} / {lat['max']}" if lat else "-"
+
+def build_bench(inputs) -> list:
+    bench = json.loads(inputs[0].read_text())
+    rows = []
+    for key, r in bench["results"].items():
+        rows.append([key, f"{r['cycles_per_dot']:.3f}" if r["cycles_per_dot"] else "-",
+                     f"{r['input_acceptance']:.3f}", lat_cell(r["latency"]), lat_cell(r.get("handshake_latency")),
+                     r["delivered"], r["dropped"]])
+    out = REPORT_DIR / "bench.md"
+    out.write_text(f"# Throughput benchmark\n\n{bench['dots']} dots per configuration, seed {bench['seed']}.\n\n"
+                   + md_table(["config", "cycles/dot", "acceptance", "to valid min / mean / max",
+                               "to handshake min / mean / max", "delivered", "dropped"], rows))
+    return [out]
+
+# ---------------- attention-row streaming ----------------
+def attention_inputs() -> list:
+    return [p for p in [TEST_DIR / "attention_results.json"] if p.exists()]
+
+def build_attention(inputs) -> list:
+    rec = json.loads(inputs[0].read_text())
+    rows = [[key, f"{val:.4g}" if isinstance(val, float) else val] for key, val in rec.items()]
+    out = REPORT_DIR / "attention.md"
+    out.write_text(f"# Attention-row streaming\n\n{rec['rows']} rows of {rec['dots'] // rec['rows']} dots, "
+                   f"seed {rec['seed']}.\n\n" + md_table(["metric", "value"], rows))
+    return [out]
+
+RESULT_SETS = {
+    "ex_error": (ex_error_inputs, build_ex_error),
+    "coverage": (coverage_inputs, build_coverage),
+    "profile":  (profile_inputs, build_profile),
+    "bench":    (bench_inputs, build_bench),
+    "attention": (attention_inputs, build_attention),
+}
+
+# ---------------- incremental driver ----------------
+def inputs_digest(paths) -> str:
+    h = hashlib.sha256()
+    for p in paths:
+        h.update(str(p.relative_to(TEST_DIR)).encode())
+        h.update(p.read_bytes())
+    return h.hexdigest()[:16]
+
+def build(names=None, force: bool = False) -> dict:
+    """Rebuild the stale result sets; returns name -> "built" / "up to date" / "no inputs"."""
+    REPORT_DIR.mkdir(exist_ok=True)
+    manifest = json.loads(MANIFEST.read_text()) if MANIFEST.exists() else {}
+    status = {}
+    for name in names or RESULT_SETS:
+        find, make = RESULT_SETS[name]
+        inputs = find()
+        if not inputs:
+            status[name] = "no inputs"
+            continue
+        digest = inputs_digest(inputs)
+        entry = manifest.get(name, {})
+        fresh = entry.get("inputs") == digest and all((TEST_DIR / o).exists() for o in entry.get("outputs", []))
+        if fresh and not force:
+            status[name] = "up to date"
+            continue
+        outputs = make(inputs)
+        manifest[name] = {"inputs": digest, "outputs": [str(p.relative_to(TEST_DIR)) for p in outputs]}
+        MANIFEST.write_text(json.dumps(manifest, indent=1, sort_keys=True))
+        status[name] = "built"
+    return status
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("names", nargs="*", help=f"result sets: {', '.join(RESULT_SETS)} (default: all)")
+    ap.add_argument("--force", action="store_true", help="rebuild even if the inputs are unchanged")
+    args = ap.parse_args()
+    unknown = sorted(set(args.names) - set(RESULT_SETS))
+    if unknown:
+        ap.error(f"unknown result sets: {', '.join(unknown)}")
+    for name, state in build(args.names, args.force).items():
+        print(f"{name:>10}: {state}")
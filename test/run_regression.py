@@ -0,0 +1,140 @@
+"""
+Sharded parallel regression: runs test_fuzz.py in N simulator processes
+(one per core by default), each with its own seed and vector shard, then
+merges the shard results.xml files and mismatch reports. The simulator image
+is built once up front ("make sim-image", see build_cache.py) and shared by
+every shard.
+
+    python run_regression.py --dots 1000000            # all cores
+    python run_regression.py --shards 8 --seed 500 SIM=verilator
+    python run_regression.py --reproduce 503 --dots-per-shard 125000
+
+Shard i uses FUZZ_SEED = seed + i, so any failing shard can be re-run alone
+from the seed printed in the summary. Extra KEY=VALUE arguments go to make.
+"""
+import argparse
+import json
+import os
+import shlex
+import subprocess
+import sys
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+TEST_DIR  = Path(__file__).resolve().parent
+SHARD_DIR = TEST_DIR / "sim_build" / "shards"
+MODULE    = "test_fuzz"
+
+def shard_sizes(total: int, shards: int):
+    base, extra = divmod(total, shards)
+    return [base + (i < extra) for i in range(shards)]
+
+def repro_command(seed: int, dots: int, make_args) -> str:
+    return " ".join(["make", f"COCOTB_TEST_MODULES={MODULE}",
+                     f"FUZZ_SEED={seed}", f"FUZZ_DOTS={dots}", *map(shlex.quote, make_args)])
+
+def run_shard(idx: int, seed: int, dots: int, make_args) -> dict:
+    out = SHARD_DIR / f"{idx:03d}"
+    out.mkdir(parents=True, exist_ok=True)
+    results = out / "results.xml"
+    report = out / "mismatches.json"
+    for stale in (results, report):
+        stale.unlink(missing_ok=True)
+
+    env = dict(os.environ,
+               FUZZ_SEED=str(seed), FUZZ_DOTS=str(dots), FUZZ_REPORT=str(report),
+               COCOTB_RESULTS_FILE=str(results))
+    cmd = ["make", "-C", str(TEST_DIR), f"COCOTB_TEST_MODULES={MODULE}", *make_args]
+    start = time.monotonic()
+    with open(out / "sim.log", "w") as log:
+        subprocess.run(cmd, env=env, stdout=log, stderr=subprocess.STDOUT)
+    wall = time.monotonic() - start
+
+    shard = {"shard": idx, "seed": seed, "dots": dots, "wall_s": round(wall, 3),
+             "log": str(out / "sim.log"), "results": str(results)}
+    if not results.exists():
+        shard["status"] = "error"
+    else:
+        tree = ET.parse(results)
+        failed = tree.findall(".//failure") + tree.findall(".//error")
+        shard["status"] = "fail" if failed else "pass"
+    if report.exists():
+        rep = json.loads(report.read_text())
+        shard["mismatches"] = rep["mismatches"]
+        shard["records"] = rep["records"]
+    if shard["status"] != "pass":
+        shard["repro"] = repro_command(seed, dots, make_args)
+    return shard
+
+def merge_results(shards, path: Path):
+    """Concatenate every shard's <testsuite> into one results.xml, tagging testcases with the seed."""
+    merged = ET.Element("testsuites", name="regression")
+    for shard in shards:
+        if shard["status"] == "error":
+            suite = ET.SubElement(merged, "testsuite", name=f"shard{shard['shard']:03d}")
+            case = ET.SubElement(suite, "testcase", name=f"{MODULE}.seed{shard['seed']}")
+            ET.SubElement(case, "error", message="simulation produced no results.xml; see " + shard["log"])
+            continue
+        for suite in ET.parse(shard["results"]).getroot().iter("testsuite"):
+            suite.set("name", f"shard{shard['shard']:03d}")
+            for case in suite.iter("testcase"):
+                case.set("name", f"{case.get('name')}.seed{shard['seed']}")
+            merged.append(suite)
+    ET.ElementTree(merged).write(path, encoding="utf-8", xml_declaration=True)
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0],
+                                 formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--shards", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--jobs", type=int, default=None, help="parallel processes (default: --shards)")
+    ap.add_argument("--dots", type=int, default=100_000, help="total dots over all shards")
+    ap.add_argument("--dots-per-shard", type=int, default=None, help="overrides --dots")
+    ap.add_argument("--seed", type=int, default=123, help="base seed; shard i uses seed + i")
+    ap.add_argument("--reproduce", type=int, metavar="SEED", help="re-run the single shard with this seed")
+    ap.add_argument("--out", type=Path, default=TEST_DIR / "results.xml", help="merged results.xml")
+    ap.add_argument("--summary", type=Path, default=TEST_DIR / "regression_summary.json")
+    ap.add_argument("make_args", nargs="*", help="extra make variables, e.g. SIM=verilator")
+    args = ap.parse_args(argv)
+
+    if args.reproduce is not None:
+        seeds = [args.reproduce]
+        sizes = [args.dots_per_shard or args.dots]
+    else:
+        sizes = [args.dots_per_shard] * args.shards if args.dots_per_shard \
+            else shard_sizes(args.dots, args.shards)
+        seeds = [args.seed + i for i in range(args.shards)]
+
+    start = time.monotonic()
+    SHARD_DIR.mkdir(parents=True, exist_ok=True)
+    with open(SHARD_DIR / "build.log", "w") as log:
+        built = subprocess.run(["make", "-C", str(TEST_DIR), "sim-image", *args.make_args],
+                               stdout=log, stderr=subprocess.STDOUT)
+    if built.returncode:
+        print(f"simulator build failed, see {SHARD_DIR / 'build.log'}")
+        return 2
+    with ThreadPoolExecutor(max_workers=args.jobs or len(seeds)) as pool:
+        shards = list(pool.map(run_shard, range(len(seeds)), seeds, sizes,
+                               [args.make_args] * len(seeds)))
+    wall = time.monotonic() - start
+
+    merge_results(shards, args.out)
+    failed = [s for s in shards if s["status"] != "pass"]
+    summary = {"dots": sum(sizes), "shards": len(shards), "failed": len(failed),
+               "wall_s": round(wall, 3), "dots_per_s": round(sum(sizes) / wall, 1),
+               "shard_results": shards}
+    args.summary.write_text(json.dumps(summary, indent=1))
+
+    print(f"{'shard':>5} {'seed':>8} {'dots':>9} {'status':>6} {'mism':>6} {'wall_s':>8}")
+    for s in shards:
+        print(f"{s['shard']:>5} {s['seed']:>8} {s['dots']:>9} {s['status']:>6} "
+              f"{s.get('mismatches', '-'):>6} {s['wall_s']:>8.1f}")
+    print(f"{sum(sizes)} dots in {wall:.1f} s over {len(shards)} shards, {len(failed)} failed")
+    for s in failed:
+        print(f"  reproduce shard {s['shard']}: {s['repro']}")
+    print(f"merged results: {args.out}\nsummary: {args.summary}")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
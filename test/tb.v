@@ -6,13 +6,40 @@
 */
 module tb ();
 
-  // Dump the signals to a VCD file. You can view it with gtkwave or surfer.
+  // Waveforms are off unless the run passes +dump (make WAVES=vcd|fst|fail, see waves.py).
+  // +dumpscope=io|dut narrows the hierarchy; dump_en is driven from Python to open
+  // and close capture windows. Under Verilator the cocotb main owns the trace instead.
+  reg dump_en = 1'b1;
+`ifndef VERILATOR
+  reg [8*8-1:0] dumpscope;
   initial begin
-    $dumpfile("tb.vcd");
-    $dumpvars(0, tb);
-    #1;
+    if ($test$plusargs("dump")) begin
+      if ($test$plusargs("fst"))
+        $dumpfile("tb.fst");
+      else
+        $dumpfile("tb.vcd");
+      if (!$value$plusargs("dumpscope=%s", dumpscope))
+        dumpscope = "all";
+      if (dumpscope == "io")
+        $dumpvars(1, tb);           // TT bus only
+      else if (dumpscope == "dut")
+        $dumpvars(1, tb.u_dut);     // top-level DUT signals, no submodules
+      else
+        $dumpvars(0, tb);
+      if ($test$plusargs("dumpoff")) begin
+        dump_en = 1'b0;             // window / on-fail modes start closed; call $dumpoff here,
+        $dumpoff;                   // the always block below may not be waiting yet at time 0
+      end
+    end
   end
 
+  always @(dump_en)
+    if ($test$plusargs("dump")) begin
+      if (dump_en) $dumpon;
+      else         $dumpoff;
+    end
+`endif
+
   // Wire up the inputs and outputs:
   reg clk;
   reg rst_n;
@@ -66,5 +93,55 @@ module tb ();
     .ex_result(ex_result)
   );
 `endif
-  
+
+  // Batched ex() equivalence (make EX_BATCH=yes, test_ex_gen.py): one ex per
+  // input code, so all 256 responses settle at once; code i is ex_batch[9*i +: 9].
+`ifdef EX_BATCH
+  wire [256*9-1:0] ex_batch;
+  genvar code_i;
+  generate
+    for (code_i = 0; code_i < 256; code_i = code_i + 1) begin : ex_code
+      ex u_ex (
+        .mac_result(8'(code_i)),
+        .ex_result(ex_batch[9*code_i +: 9])
+      );
+    end
+  endgenerate
+`endif
+
+  // Multi-instance mode (make INSTANCES=N): N more copies of the top level on
+  // the shared clk / rst_n / ena, each with its own TT bus under tb.lane[i],
+  // so one simulator process runs N independent vector shards (test_multi.py).
+`ifdef TB_INSTANCES
+  genvar lane_i;
+  generate
+    for (lane_i = 0; lane_i < `TB_INSTANCES; lane_i = lane_i + 1) begin : lane
+      reg  [7:0] ui_in;
+      reg  [7:0] uio_in;
+      wire [7:0] uo_out;
+      wire [7:0] uio_out;
+      wire [7:0] uio_oe;
+      tt_um_attention_top u_dut (
+        .ui_in(ui_in),
+        .uo_out(uo_out),
+        .uio_in(uio_in),
+        .uio_out(uio_out),
+        .uio_oe(uio_oe),
+        .ena(ena),
+        .clk(clk),
+        .rst_n(rst_n)
+      );
+`ifdef EX_ONLY
+      reg  [7:0] mac_result;
+      wire [8:0] ex_result;
+      ex u_ex (
+        .mac_result(mac_result),
+        .ex_result(ex_result)
+      );
+`endif
+    end
+  endgenerate
+`endif
+
+
 endmodule
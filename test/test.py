@@ -1,112 +1,89 @@
 import cocotb
 from cocotb.clock import Clock
-from cocotb.triggers import RisingEdge, Timer
+from cocotb.triggers import ClockCycles, RisingEdge, with_timeout
+from cocotb.utils import get_sim_time
 import numpy as np
 
+from error_dist import ex_error_bound
+from ex_coverage import ExCoverage, directed_stimulus
+from ex_model import ex_lookup
+from fixedpoint import Q0_7, Q1_6, UQ3_6, Fixed
+from harness import OutputMonitor, Scoreboard, SinkReady, StreamDriver, TTPins, reset
+from mac_model import mac_path_batch
+from profiling import profiled
+from top_model import run_trace
+from tx_trace import TraceRecorder
+
 
 # ---------- helpers ----------
-def encode_q0_7(x_real: float) -> int:
-    """Q0.7 signed encode into int8 (-128..127)."""
-    q = int(np.round(x_real * 128.0))
-    return int(np.clip(q, -128, 127)) & 0xFF  # two's complement for dut
-
-def decode_uq3_6(lo8: int, hi1: int) -> float:
-    """UQ3.6 decode from 9 bits: [8]=hi1, [7:0]=lo8."""
-    raw = ((hi1 & 1) << 8) | (lo8 & 0xFF)
-    return raw / 64.0  # LSB = 2^-6
-
-async def reset(dut, cycles=5):
-    dut.rst_n.value = 0
-    dut.uio_in.value = 0  # clear vld/rdy
-    dut.ui_in.value = 0
-    await Timer(1, "ns")
-    for _ in range(cycles):
-        await RisingEdge(dut.clk)
-    dut.rst_n.value = 1
-    for _ in range(cycles):
-        await RisingEdge(dut.clk)
+def encode_q0_7(x_real) -> list:
+    """Q0.7 bus codes (0..255, two's complement) of reals, rounded and saturated; nested lists."""
+    return Fixed.from_real(x_real, Q0_7).bus.tolist()
 
-def set_bit(val: int, bit: int, one: bool) -> int:
-    return (val | (1 << bit)) if one else (val & ~(1 << bit))
+def decode_uq3_6(raw9) -> float:
+    """UQ3.6 decode from the raw 9-bit result {uio_out[4], uo_out}."""
+    return float(Fixed(raw9, UQ3_6).real)  # LSB = 2^-6
 
-async def feed_term(dut, a_q07: int, b_q07: int):
+async def feed_term(pins: TTPins, a_q07: int, b_q07: int):
     """Feed one term = two beats (A then B) with vld=1, obeying rdy, then deassert vld."""
-    # Ensure vld=0 initially
-    dut.uio_in.value = set_bit(int(dut.uio_in.value), 0, False)
-
     # Beat 1: A (assert vld)
-    dut.ui_in.value = a_q07
-    dut.uio_in.value = set_bit(int(dut.uio_in.value), 0, True)   # vld_slv_in=1
+    pins.drive(data=a_q07, vld_slv_in=1)
 
     # wait until rdy_slv_out_w==1 (uio_out[1]) then clock in
-    while ((int(dut.uio_out.value) >> 1) & 1) == 0:
-        await RisingEdge(dut.clk)
-    await RisingEdge(dut.clk)
+    while not pins.sample().rdy_slv_out:
+        await RisingEdge(pins.clk)
+    await RisingEdge(pins.clk)
 
     # Beat 2: B (keep vld=1)
-    dut.ui_in.value = b_q07
-    await RisingEdge(dut.clk)  # WAIT4SECOND only checks vld==1
+    pins.data = b_q07
+    await RisingEdge(pins.clk)  # WAIT4SECOND only checks vld==1
 
     # Deassert vld, idle input to avoid accidental capture
-    dut.uio_in.value = set_bit(int(dut.uio_in.value), 0, False)
-    dut.ui_in.value = 0
+    pins.drive(data=0, vld_slv_in=0)
 
-async def drain_output(dut):
+async def drain_output(pins: TTPins):
     """Assert rdy_mst_in=1 for one cycle to accept output (uio_in[3])."""
-    dut.uio_in.value = set_bit(int(dut.uio_in.value), 3, True)
-    await RisingEdge(dut.clk)
-    dut.uio_in.value = set_bit(int(dut.uio_in.value), 3, False)
+    pins.rdy_mst_in = 1
+    await RisingEdge(pins.clk)
+    pins.rdy_mst_in = 0
 
 
 @cocotb.test()
+@profiled
 async def test_single_dot_exp(dut):
     """Feed 4 terms (8 beats), expect one UQ3.6 e^x output."""
     cocotb.start_soon(Clock(dut.clk, 10, "ns").start())
-    await reset(dut)
+    pins = await reset(dut)
 
     # Keep rdy_mst_in high most of the time (accept as soon as valid asserts)
-    dut.uio_in.value = set_bit(int(dut.uio_in.value), 3, True)
+    pins.rdy_mst_in = 1
 
     # Choose 4 pairs (A,B) in Q0.7 range ~ [-1,1)
     pairs_real = [(-0.75, 0.50), (0.25, -0.50), (0.60, 0.40), (-0.30, 0.20)]
-    pairs_q = [(encode_q0_7(a), encode_q0_7(b)) for a, b in pairs_real]
+    pairs_q = encode_q0_7(pairs_real)
 
     # Feed 4 terms
     for (aq, bq) in pairs_q:
-        await feed_term(dut, aq, bq)
+        await feed_term(pins, aq, bq)
 
     # Wait until DUT raises valid (uio_out[2]==1)
     for _ in range(100):
         await RisingEdge(dut.clk)
-        if ((int(dut.uio_out.value) >> 2) & 1) == 1:
+        if pins.sample().vld_mst_out:
             break
     else:
         assert False, "Timeout waiting for vld_mst_out_w=1"
 
-    # Sample output (uo_out[7:0], uio_out[4])
-    lo8 = int(dut.uo_out.value) & 0xFF
-    hi1 = (int(dut.uio_out.value) >> 4) & 1
-    y_dut = decode_uq3_6(lo8, hi1)
+    # Sample output ({uio_out[4], uo_out[7:0]})
+    y_dut = decode_uq3_6(pins.sample().result)
 
     # Accept the output to clear valid
-    await drain_output(dut)
+    await drain_output(pins)
 
     # ----- compute expected x that DUT feeds to exp -----
     # mac_sum = sum_i (Ai * Bi) using int8 * int8 products (two's complement)
     # mac_reduced = (mac_sum >>> 10) (Q1.6 integer), x_real = x_fixed / 64
-    products = []
-    for (aq, bq) in pairs_q:
-        a = np.int8(aq).item()
-        b = np.int8(bq).item()
-        products.append(int(a) * int(b))
-    mac_sum = int(np.int32(np.sum(products)))
-
-    def arshift(val, sh):
-        # Python right shift is already arithmetic for ints, but keep explicit
-        return val >> sh
-
-    x_fixed = arshift(mac_sum, 10)  # Q1.6 integer
-    x_real = x_fixed / 64.0
+    x_real = float(Fixed(mac_path_batch(pairs_q).mac_reduced, Q1_6).real)
 
     y_ref = float(np.exp(x_real))
 
@@ -119,13 +96,14 @@ async def test_single_dot_exp(dut):
 
 
 @cocotb.test()
+@profiled
 async def test_back_to_back_tokens(dut):
     """Two consecutive dots (8 terms total) with continuous backpressure-free sink."""
     cocotb.start_soon(Clock(dut.clk, 10, "ns").start())
-    await reset(dut)
+    pins = await reset(dut)
 
     # Always ready to accept
-    dut.uio_in.value = set_bit(int(dut.uio_in.value), 3, True)
+    pins.rdy_mst_in = 1
 
     # Build two dots, each 4 terms
     sets = [
@@ -134,25 +112,22 @@ async def test_back_to_back_tokens(dut):
     ]
 
     for dot_idx, pairs in enumerate(sets):
-        for a, b in pairs:
-            aq, bq = encode_q0_7(a), encode_q0_7(b)
-            await feed_term(dut, aq, bq)
+        for aq, bq in encode_q0_7(pairs):
+            await feed_term(pins, aq, bq)
 
         # Wait for valid
         for _ in range(100):
             await RisingEdge(dut.clk)
-            if ((int(dut.uio_out.value) >> 2) & 1) == 1:
+            if pins.sample().vld_mst_out:
                 break
         else:
             assert False, f"Timeout waiting for vld (dot {dot_idx})"
 
         # Capture + decode
-        lo8 = int(dut.uo_out.value) & 0xFF
-        hi1 = (int(dut.uio_out.value) >> 4) & 1
-        y_dut = decode_uq3_6(lo8, hi1)
+        y_dut = decode_uq3_6(pins.sample().result)
 
         # Accept and clear valid
-        await drain_output(dut)
+        await drain_output(pins)
 
         # Quick sanity: e^x must be strictly positive
         assert y_dut >= 0.0, "exp output must be non-negative"
@@ -160,68 +135,59 @@ async def test_back_to_back_tokens(dut):
 
 from cocotb.triggers import First
 
-async def wait_for_valid(dut, cycles=200):
+async def wait_for_valid(pins: TTPins, cycles=200):
     """Wait until DUT raises valid (uio_out[2]==1), else fail."""
     for _ in range(cycles):
-        await RisingEdge(dut.clk)
-        if ((int(dut.uio_out.value) >> 2) & 1) == 1:
+        await RisingEdge(pins.clk)
+        if pins.sample().vld_mst_out:
             return
     assert False, "Timeout waiting for vld_mst_out_w=1"
 
 
 @cocotb.test()
+@profiled
 async def test_zero_vector(dut):
     """All terms zero -> x=0, expect e^0≈1."""
     cocotb.start_soon(Clock(dut.clk, 10, "ns").start())
-    await reset(dut)
-    dut.uio_in.value = set_bit(int(dut.uio_in.value), 3, True)  # always ready
+    pins = await reset(dut)
+    pins.rdy_mst_in = 1  # always ready
 
     # 4 terms: (0,0)
-    pairs_q = [(encode_q0_7(0.0), encode_q0_7(0.0)) for _ in range(4)]
+    pairs_q = encode_q0_7(np.zeros((4, 2)))
     for aq, bq in pairs_q:
-        await feed_term(dut, aq, bq)
+        await feed_term(pins, aq, bq)
 
-    await wait_for_valid(dut)
-    lo8 = int(dut.uo_out.value) & 0xFF
-    hi1 = (int(dut.uio_out.value) >> 4) & 1
-    y_dut = decode_uq3_6(lo8, hi1)
-    await drain_output(dut)
+    await wait_for_valid(pins)
+    y_dut = decode_uq3_6(pins.sample().result)
+    await drain_output(pins)
 
     y_ref = 1.0
     assert abs(y_dut - y_ref) <= 0.05, f"e^0 should be ~1.0, got {y_dut:.4f}"
 
 
 @cocotb.test()
+@profiled
 async def test_fourth_term_dominates(dut):
     """
     First three products ~0, last product large.
     This stresses 'capture after 4th MAC' behavior.
     """
     cocotb.start_soon(Clock(dut.clk, 10, "ns").start())
-    await reset(dut)
-    dut.uio_in.value = set_bit(int(dut.uio_in.value), 3, True)
+    pins = await reset(dut)
+    pins.rdy_mst_in = 1
 
     # Three tiny products, one big positive product
     pairs_real = [(0.0, 0.0), (0.01, -0.01), (-0.01, 0.01), (0.95, 0.95)]
-    pairs_q = [(encode_q0_7(a), encode_q0_7(b)) for a, b in pairs_real]
+    pairs_q = encode_q0_7(pairs_real)
     for aq, bq in pairs_q:
-        await feed_term(dut, aq, bq)
+        await feed_term(pins, aq, bq)
 
-    await wait_for_valid(dut)
-    lo8 = int(dut.uo_out.value) & 0xFF
-    hi1 = (int(dut.uio_out.value) >> 4) & 1
-    y_dut = decode_uq3_6(lo8, hi1)
-    await drain_output(dut)
+    await wait_for_valid(pins)
+    y_dut = decode_uq3_6(pins.sample().result)
+    await drain_output(pins)
 
     # Compute reference from exact fixed-point path
-    prods = []
-    for aq, bq in pairs_q:
-        a = np.int8(aq).item()
-        b = np.int8(bq).item()
-        prods.append(int(a) * int(b))
-    mac_sum = int(np.int32(np.sum(prods)))
-    x_fixed = mac_sum >> 10
-    x_real = x_fixed / 64.0
+    x_real = float(Fixed(mac_path_batch(pairs_q).mac_reduced, Q1_6).real)
     y_ref = float(np.exp(x_real))
 
     tol = 0.06
@@ -229,47 +195,46 @@ async def test_fourth_term_dominates(dut):
 
 
 @cocotb.test()
+@profiled
 async def test_sink_backpressure(dut):
     """
     Hold rdy_mst_in low for several cycles after valid;
     DUT should hold valid and keep output stable.
     """
     cocotb.start_soon(Clock(dut.clk, 10, "ns").start())
-    await reset(dut)
+    pins = await reset(dut)
 
     # rdy low initially
-    dut.uio_in.value = set_bit(int(dut.uio_in.value), 3, False)
+    pins.rdy_mst_in = 0
 
     # Feed a dot
     pairs_real = [(0.7, 0.7), (0.6, -0.4), (-0.5, 0.2), (0.3, 0.9)]
-    pairs_q = [(encode_q0_7(a), encode_q0_7(b)) for a, b in pairs_real]
+    pairs_q = encode_q0_7(pairs_real)
     for aq, bq in pairs_q:
-        await feed_term(dut, aq, bq)
+        await feed_term(pins, aq, bq)
 
     # Wait for valid
-    await wait_for_valid(dut)
-    lo8_1 = int(dut.uo_out.value) & 0xFF
-    hi1_1 = (int(dut.uio_out.value) >> 4) & 1
+    await wait_for_valid(pins)
+    out_1 = pins.sample()
 
     # Keep rdy low for a few cycles; output/valid must remain stable
     for _ in range(5):
         await RisingEdge(dut.clk)
-        lo8_2 = int(dut.uo_out.value) & 0xFF
-        hi1_2 = (int(dut.uio_out.value) >> 4) & 1
-        vld   = (int(dut.uio_out.value) >> 2) & 1
-        assert vld == 1, "valid dropped under backpressure"
-        assert (lo8_2 == lo8_1) and (hi1_2 == hi1_1), "output changed under backpressure"
+        out_2 = pins.sample()
+        assert out_2.vld_mst_out == 1, "valid dropped under backpressure"
+        assert out_2.result == out_1.result, "output changed under backpressure"
 
     # Now accept result
-    await drain_output(dut)
+    await drain_output(pins)
 
 
 @cocotb.test()
+@profiled
 async def test_extreme_ranges(dut):
     """Drive inputs that push x near -2 and +2 to check saturation / range tails."""
     cocotb.start_soon(Clock(dut.clk, 10, "ns").start())
-    await reset(dut)
-    dut.uio_in.value = set_bit(int(dut.uio_in.value), 3, True)
+    pins = await reset(dut)
+    pins.rdy_mst_in = 1
 
     # Two stress cases: mostly positive vs mostly negative dot
     cases = [
@@ -278,25 +243,16 @@ async def test_extreme_ranges(dut):
     ]
 
     for idx, pairs_real in enumerate(cases):
-        pairs_q = [(encode_q0_7(a), encode_q0_7(b)) for a, b in pairs_real]
+        pairs_q = encode_q0_7(pairs_real)
         for aq, bq in pairs_q:
-            await feed_term(dut, aq, bq)
+            await feed_term(pins, aq, bq)
 
-        await wait_for_valid(dut)
-        lo8 = int(dut.uo_out.value) & 0xFF
-        hi1 = (int(dut.uio_out.value) >> 4) & 1
-        y_dut = decode_uq3_6(lo8, hi1)
-        await drain_output(dut)
+        await wait_for_valid(pins)
+        y_dut = decode_uq3_6(pins.sample().result)
+        await drain_output(pins)
 
         # Reference from actual path
-        prods = []
-        for aq, bq in pairs_q:
-            a = np.int8(aq).item()
-            b = np.int8(bq).item()
-            prods.append(int(a) * int(b))
-        mac_sum = int(np.int32(np.sum(prods)))
-        x_fixed = mac_sum >> 10
-        x_real = x_fixed / 64.0
+        x_real = float(Fixed(mac_path_batch(pairs_q).mac_reduced, Q1_6).real)
         y_ref = float(np.exp(x_real))
 
         # Relax tolerance slightly for extremes
@@ -305,45 +261,180 @@ async def test_extreme_ranges(dut):
 
 
 @cocotb.test()
+@profiled
 async def test_random_fuzz_100(dut):
     """100 random dots, check error <= tol and monotonicity wrt x."""
     rng = np.random.default_rng(123)
     cocotb.start_soon(Clock(dut.clk, 10, "ns").start())
-    await reset(dut)
-    dut.uio_in.value = set_bit(int(dut.uio_in.value), 3, True)
+    pins = await reset(dut)
+    pins.rdy_mst_in = 1
+
+    # Precompute all stimulus and the fixed-point reference in one batch
+    pairs_real = rng.uniform(-0.99, 0.99, size=(100, 4, 2))
+    pairs_q = Fixed.from_real(pairs_real, Q0_7).bus
+    x_real = Fixed(mac_path_batch(pairs_q).mac_reduced, Q1_6).real
+    y_ref = np.exp(x_real)
+
+    # Stream everything, then check in bulk
+    monitor = OutputMonitor(pins)
+    driver = StreamDriver(pins)
+    driver.send(pairs_q)
+    y_dut = Fixed(await with_timeout(monitor.collect(100), 100_000, "ns"), UQ3_6).real
+    driver.stop()
+    monitor.stop()
+
+    cov = ExCoverage()
+    cov.sample(mac_path_batch(pairs_q).mac_reduced)
+    dut._log.info(f"random stimulus coverage: {cov.summary()}")
+
+    tol = ex_error_bound()  # exact worst ex() error over all reachable codes (error_dist.py)
+    err = np.abs(y_dut - y_ref)
+    bad = np.flatnonzero(err > tol)
+    assert bad.size == 0, "; ".join(f"[#{t}] err={err[t]:.4f} > {tol:.4f}" for t in bad)
+
+    # Weak monotonicity sanity: if x increases noticeably, y should not decrease
+    rising = np.flatnonzero(np.diff(x_real) > 0.05) + 1
+    fell = rising[y_dut[rising] < y_dut[rising - 1] - 0.05]
+    assert fell.size == 0, f"monotonicity violated: x↑ but y fell at dots {fell.tolist()}"
 
-    last_x = None
-    last_y = None
 
-    for t in range(100):
-        pairs_real = [(float(rng.uniform(-0.99, 0.99)),
-                       float(rng.uniform(-0.99, 0.99))) for _ in range(4)]
-        pairs_q = [(encode_q0_7(a), encode_q0_7(b)) for a, b in pairs_real]
-        for aq, bq in pairs_q:
-            await feed_term(dut, aq, bq)
+@cocotb.test()
+@profiled
+async def test_stream_2000_dots(dut):
+    """2000 back-to-back dots at one beat per cycle, every result checked bit-exact."""
+    n = 2000
+    rng = np.random.default_rng(7)
+    cocotb.start_soon(Clock(dut.clk, 10, "ns").start())
+    pins = await reset(dut)
+    pins.rdy_mst_in = 1  # always ready
 
-        await wait_for_valid(dut)
-        lo8 = int(dut.uo_out.value) & 0xFF
-        hi1 = (int(dut.uio_out.value) >> 4) & 1
-        y_dut = decode_uq3_6(lo8, hi1)
-        await drain_output(dut)
+    pairs_q = rng.integers(-128, 128, size=(n, 4, 2)) & 0xFF
+    path = mac_path_batch(pairs_q)
+    expected = ex_lookup(path.mac_reduced)
 
-        # Reference via fixed-point recompute
-        prods = []
-        for aq, bq in pairs_q:
-            a = np.int8(aq).item()
-            b = np.int8(bq).item()
-            prods.append(int(a) * int(b))
-        mac_sum = int(np.int32(np.sum(prods)))
-        x_fixed = mac_sum >> 10
-        x_real = x_fixed / 64.0
-        y_ref = float(np.exp(x_real))
+    monitor = OutputMonitor(pins)
+    driver = StreamDriver(pins)
+    start = get_sim_time("ns")
+    driver.send(pairs_q)
+
+    got = await with_timeout(monitor.collect(n), 100 * n, "ns")
+    cycles = int((get_sim_time("ns") - start) // 10)
+    driver.stop()
+    monitor.stop()
+
+    Scoreboard(expected, x_q16=path.mac_reduced).check(got)
+    # 8 beats per dot plus pipeline fill: the driver must keep up with the DUT
+    assert cycles <= 8 * n + 4, f"{cycles} cycles for {n} dots"
+
+
+@cocotb.test()
+@profiled
+async def test_stream_random_gaps(dut):
+    """Random valid gaps inside and between dots: still exactly one result per dot."""
+    n = 500
+    rng = np.random.default_rng(11)
+    cocotb.start_soon(Clock(dut.clk, 10, "ns").start())
+    pins = await reset(dut)
+    pins.rdy_mst_in = 1  # always ready
+
+    pairs_q = rng.integers(-128, 128, size=(n, 4, 2)) & 0xFF
+    path = mac_path_batch(pairs_q)
+    scoreboard = Scoreboard(ex_lookup(path.mac_reduced), x_q16=path.mac_reduced)
+
+    monitor = OutputMonitor(pins)
+    driver = StreamDriver(pins, gap_prob=0.3, seed=5)
+    driver.send(pairs_q)
+    await driver.wait_idle()
+    # idle for a while after the last dot: no repeated handshakes allowed
+    for _ in range(20):
+        await RisingEdge(dut.clk)
+    driver.stop()
+    monitor.stop()
+
+    got = [monitor.queue.get_nowait() for _ in range(monitor.queue.qsize())]
+    scoreboard.check(got)
+
+
+@cocotb.test()
+@profiled
+async def test_ack_on_latch_cycle(dut):
+    """
+    Back-to-back dots with rdy_mst_in high only on the edge that latches a
+    new result: that edge acknowledges the held previous result in the same
+    cycle. Every result must still be delivered exactly once, in order.
+    """
+    n = 50
+    rng = np.random.default_rng(13)
+    cocotb.start_soon(Clock(dut.clk, 10, "ns").start())
+    pins = await reset(dut)
+
+    pairs_q = rng.integers(-128, 128, size=(n, 4, 2)) & 0xFF
+    path = mac_path_batch(pairs_q)
+    scoreboard = Scoreboard(ex_lookup(path.mac_reduced), x_q16=path.mac_reduced)
 
-        tol = 0.064 # we expect 0.4 since only e^x delivers 0.2 at higher values of e^x
-        assert abs(y_dut - y_ref) <= tol, f"[#{t}] err={abs(y_dut-y_ref):.4f} > {tol:.4f}"
+    monitor = OutputMonitor(pins)
+    # done_mac rises on the edge that takes a dot's 8th beat and the result
+    # latches one edge later, while the next dot's first beat is on the bus
+    for idx, beat in enumerate(pairs_q.reshape(-1).tolist()):
+        pins.drive(data=beat, vld_slv_in=1, rdy_mst_in=int(idx >= 8 and idx % 8 == 0))
+        await RisingEdge(dut.clk)
+    pins.drive(data=0, vld_slv_in=0, rdy_mst_in=1)   # the last latch, then drain
+    await ClockCycles(dut.clk, 20)
+    monitor.stop()
+
+    got = [monitor.queue.get_nowait() for _ in range(monitor.queue.qsize())]
+    scoreboard.check(got)
+
+
+@cocotb.test()
+@profiled
+async def test_directed_coverage(dut):
+    """One dot per reachable Q1.6 code: closes every ex() coverage bin, checked bit-exact."""
+    cocotb.start_soon(Clock(dut.clk, 10, "ns").start())
+    pins = await reset(dut)
+    pins.rdy_mst_in = 1  # always ready
 
-        # Weak monotonicity sanity: if x increases noticeably, y should not decrease
-        if last_x is not None and (x_real - last_x) > 0.05:
-            assert y_dut >= (last_y - 0.05), f"monotonicity violated: x↑ but y fell"
+    pairs_q = directed_stimulus()
+    x_q16 = mac_path_batch(pairs_q).mac_reduced
+    scoreboard = Scoreboard(ex_lookup(x_q16), x_q16=x_q16)
 
-        last_x, last_y = x_real, y_dut
\ No newline at end of file
+    monitor = OutputMonitor(pins)
+    driver = StreamDriver(pins)
+    driver.send(pairs_q)
+    got = await with_timeout(monitor.collect(len(pairs_q)), 100 * len(pairs_q), "ns")
+    driver.stop()
+    monitor.stop()
+
+    scoreboard.check(got)
+    cov = ExCoverage()
+    cov.sample(x_q16)
+    dut._log.info(f"directed coverage ({len(pairs_q)} dots): {cov.summary()}")
+    assert cov.complete(), f"coverage holes: {cov.report()}"
+
+
+@cocotb.test()
+@profiled
+async def test_top_model_timing(dut):
+    """Random gaps and sink stalls: handshake cycles, data and drops match top_model.run() exactly."""
+    n = 400
+    rng = np.random.default_rng(17)
+    cocotb.start_soon(Clock(dut.clk, 10, "ns").start())
+    pins = await reset(dut)
+    sink = SinkReady(pins, "random:0.3", seed=17)
+
+    recorder = TraceRecorder(pins)
+    driver = StreamDriver(pins, gap_prob=0.2, seed=17)
+    driver.send(rng.integers(-128, 128, size=(n, 4, 2)) & 0xFF)
+    await driver.wait_idle()
+    await ClockCycles(pins.clk, 40)   # drain the held result
+    driver.stop()
+    sink.stop()
+    trace = recorder.stop()
+
+    model = run_trace(trace)
+    dut._log.info(f"{n} dots: {len(trace.out_cycle)} delivered, model drops {int(model.dropped.sum())}")
+    assert len(trace.beat_cycle) == 8 * n
+    assert len(model.out_cycle) == len(trace.out_cycle), \
+        f"model delivers {len(model.out_cycle)} results, RTL {len(trace.out_cycle)}"
+    assert (model.out_cycle == trace.out_cycle).all(), "handshake cycles differ from the model"
+    assert (model.out_data == trace.out_data).all(), "results differ from the model"
@@ -0,0 +1,93 @@
+"""
+Attention-row streaming through the TT interface. A row is one query against
+N_TOK keys, i.e. N_TOK dots sent back to back, and ATTN_ROWS rows follow each
+other with no waits in between. The monitor's exponentials are reshaped into
+a (rows, N_TOK) matrix, then softmax normalization and the weighted sum with V
+run offline for the whole batch (attention_model.softmax_fixed):
+
+    make COCOTB_TEST_MODULES=test_attention ATTN_ROWS=5000
+
+The run is checked bit-exact against the golden model and scored against
+float64 attention at the datapath's logit scale (attention_model.LOGIT_SCALE).
+Throughput (rows per wall-second and cycles per row) and accuracy go to
+ATTN_OUT (default attention_results.json; see report.py).
+"""
+import json
+import os
+import time
+from pathlib import Path
+
+import cocotb
+from cocotb.clock import Clock
+from cocotb.triggers import with_timeout
+from cocotb.utils import get_sim_time
+import numpy as np
+
+from attention_model import D_K, LOGIT_SCALE, N_TOK, attention_fixed, attention_float, row_pairs, softmax_fixed
+from harness import OutputMonitor, Scoreboard, StreamDriver, reset
+from profiling import profiled
+
+ATTN_ROWS = int(os.environ.get("ATTN_ROWS", "500"))
+ATTN_SEED = int(os.environ.get("ATTN_SEED", "7"))
+ATTN_OUT  = Path(os.environ.get("ATTN_OUT", "attention_results.json"))
+CLK_NS    = 10
+
+def random_rows(rng, rows: int):
+    """Q0.7 codes for 'rows' attention rows: q (R, d_k), k (R, n, d_k), v (R, n, 1)."""
+    q = rng.integers(-128, 128, size=(rows, D_K), dtype=np.int64)
+    k = rng.integers(-128, 128, size=(rows, N_TOK, D_K), dtype=np.int64)
+    v = rng.integers(-128, 128, size=(rows, N_TOK, 1), dtype=np.int64)
+    return q, k, v
+
+@cocotb.test()
+@profiled
+async def test_attention_rows(dut):
+    """ATTN_ROWS back-to-back rows; softmax and weighted sum computed offline from the exp matrix."""
+    cocotb.start_soon(Clock(dut.clk, CLK_NS, "ns").start())
+    pins = await reset(dut)
+    pins.rdy_mst_in = 1   # the softmax stage downstream always takes results
+
+    q, k, v = random_rows(np.random.default_rng(ATTN_SEED), ATTN_ROWS)
+    pairs = row_pairs(q, k).reshape(-1, D_K, 2)
+    model = attention_fixed(q[:, None], k, v)
+
+    wall0, sim0 = time.perf_counter(), get_sim_time("ns")
+    monitor = OutputMonitor(pins)
+    driver = StreamDriver(pins)
+    driver.send(pairs)
+    got = await with_timeout(monitor.collect(len(pairs)), 200 * len(pairs) + 1000, "ns")
+    driver.stop()
+    monitor.stop()
+    sim_cycles = round((get_sim_time("ns") - sim0) / CLK_NS)
+    wall_sim = time.perf_counter() - wall0
+
+    e_rows = got.reshape(ATTN_ROWS, N_TOK)
+    _, _, a_q16, out_q7 = softmax_fixed(e_rows, v)
+    wall = time.perf_counter() - wall0
+
+    Scoreboard(model.e_q6.reshape(-1), x_q16=model.x_q16.reshape(-1)).check(got)
+    bad_rows = np.flatnonzero((out_q7 != model.out_q7[:, 0]).any(axis=-1))
+    assert bad_rows.size == 0, f"offline softmax != golden model at rows {bad_rows[:16].tolist()}"
+
+    p, out_ref = attention_float(q[:, None], k, v)
+    sm_err = np.abs(a_q16 / 65536.0 - p[:, 0]).max(axis=-1)
+    out_err = np.abs(out_q7 / 128.0 - out_ref[:, 0])
+    record = {
+        "rows": ATTN_ROWS,
+        "seed": ATTN_SEED,
+        "dots": len(pairs),
+        "sim_cycles": sim_cycles,
+        "cycles_per_row": sim_cycles / ATTN_ROWS,
+        "wall_s": round(wall, 4),
+        "offline_s": round(wall - wall_sim, 4),
+        "rows_per_wall_s": round(ATTN_ROWS / wall, 1),
+        "logit_scale": LOGIT_SCALE,
+        "softmax_err_max": float(sm_err.max()),
+        "softmax_err_mean": float(sm_err.mean()),
+        "out_err_max": float(out_err.max()),
+        "out_err_mean": float(out_err.mean()),
+        "out_err_rms": float(np.sqrt(np.mean(out_err ** 2))),
+    }
+    ATTN_OUT.write_text(json.dumps(record, indent=1))
+    dut._log.info(f"{ATTN_ROWS} rows: {record['rows_per_wall_s']} rows/s, {record['cycles_per_row']:.2f} cycles/row, "
+                  f"softmax err max {record['softmax_err_max']:.4f}, output err max {record['out_err_max']:.4f}")
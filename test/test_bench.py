@@ -0,0 +1,145 @@
+"""
+Throughput and latency benchmark for tt_um_attention_top.
+
+Sweeps offered input load (random valid gaps) against sink backpressure
+patterns on rdy_mst_in and records, per configuration: input acceptance,
+cycles per delivered dot, sustained dots per cycle and, for every delivered
+dot, histograms of cycles from its 8th input beat to the first cycle its
+result shows vld_mst_out (latency) and to its output handshake
+(handshake_latency), next to the number of dropped results.
+
+    make COCOTB_TEST_MODULES=test_bench                 # check against bench_baseline.json
+    make COCOTB_TEST_MODULES=test_bench BENCH_UPDATE=1  # record a new baseline
+
+Results go to BENCH_OUT (default bench_results.json). Cycle counts are
+deterministic for a given seed, so any growth in cycles per dot beyond
+BENCH_TOL (default 0) against the baseline fails the test.
+"""
+import json
+import os
+from pathlib import Path
+
+import cocotb
+from cocotb.clock import Clock
+from cocotb.triggers import ClockCycles
+from cocotb.utils import get_sim_time
+import numpy as np
+
+from ex_model import ex_lookup
+from harness import OutputMonitor, SinkReady, StreamDriver, reset
+from mac_model import mac_path_batch
+from profiling import profiled
+
+BENCH_DOTS     = int(os.environ.get("BENCH_DOTS", "500"))
+BENCH_SEED     = int(os.environ.get("BENCH_SEED", "2024"))
+BENCH_OUT      = Path(os.environ.get("BENCH_OUT", "bench_results.json"))
+BENCH_BASELINE = Path(os.environ.get("BENCH_BASELINE", Path(__file__).resolve().parent / "bench_baseline.json"))
+BENCH_UPDATE   = os.environ.get("BENCH_UPDATE", "0") == "1"
+BENCH_TOL      = float(os.environ.get("BENCH_TOL", "0.0"))
+
+GAP_PROBS   = [0.0, 0.25, 0.5]                    # offered load: P(idle cycle) before each beat
+READY_PATTERNS = ["always", "every:4", "random:0.5"]
+CLK_NS      = 10
+DRAIN_CYCLES = 32
+
+def config_key(gap_prob: float, ready: str) -> str:
+    return f"gap{gap_prob:g}/{ready}"
+
+async def run_config(dut, gap_prob: float, ready: str, dots: int, seed: int) -> dict:
+    pins = await reset(dut)
+    sink = SinkReady(pins, ready, seed=seed)
+    pairs_q = np.random.default_rng(seed).integers(-128, 128, size=(dots, 4, 2)) & 0xFF
+    expected = ex_lookup(mac_path_batch(pairs_q).mac_reduced)
+
+    monitor = OutputMonitor(pins, record_times=True)
+    driver = StreamDriver(pins, gap_prob=gap_prob, seed=seed, record_times=True)
+    t0 = get_sim_time("ns")
+    driver.send(pairs_q)
+    await driver.wait_idle()
+    t_in = get_sim_time("ns")
+    await ClockCycles(pins.clk, DRAIN_CYCLES)   # let held / in-flight results out
+    driver.stop()
+    monitor.stop()
+    sink.stop()
+
+    got = np.array([monitor.queue.get_nowait() for _ in range(monitor.queue.qsize())], dtype=np.int64)
+    out_times = np.array(monitor.times)
+    delivered = len(got)
+    span = (out_times[-1] - t0) / CLK_NS + 1 if delivered else float("nan")
+
+    # One dot is in flight at a time, so a result first shows valid after its own
+    # 8th beat and before the next dot's: that picks the dot for every offer.
+    dot_times = np.array(driver.dot_times)
+    valid_times = np.array(monitor.valid_times)
+    offer_dot = np.searchsorted(dot_times, valid_times) - 1
+    offers = np.array(monitor.offers, dtype=np.int64)
+    dot = offer_dot[offers]
+    beat_times = dot_times[dot] - CLK_NS   # start of the cycle the 8th beat is on the bus (top_model's c8)
+    record = {
+        "gap_prob": gap_prob,
+        "ready": ready,
+        "dots": dots,
+        "beats": driver.beats_sent,
+        "stall_cycles": driver.stall_cycles,
+        "input_acceptance": driver.beats_sent / (driver.beats_sent + driver.stall_cycles),
+        "input_cycles_per_dot": (t_in - t0) / CLK_NS / dots,
+        "delivered": delivered,
+        "dropped": dots - delivered,
+        "cycles_per_dot": span / delivered if delivered else None,
+        "dots_per_cycle": delivered / span if delivered else 0.0,
+        "bit_exact": bool(delivered == dots and (got == expected).all()),
+        "latency": cycle_stats((valid_times[offers] - beat_times) / CLK_NS),
+        "handshake_latency": cycle_stats((out_times - beat_times) / CLK_NS),
+    }
+    assert (got == expected[dot]).all(), "a delivered result does not match the dot it was attributed to"
+    return record
+
+def cycle_stats(cycles: np.ndarray):
+    """min / mean / max and histogram of per-dot cycle counts, None if there are none."""
+    if cycles.size == 0:
+        return None
+    cycles = np.rint(cycles).astype(np.int64)
+    vals, counts = np.unique(cycles, return_counts=True)
+    return {"min": int(cycles.min()), "mean": float(cycles.mean()), "max": int(cycles.max()),
+            "hist": {str(v): int(c) for v, c in zip(vals, counts)}}
+
+@cocotb.test()
+@profiled
+async def test_benchmark(dut):
+    """Offered load x backpressure sweep; fails if cycles per dot regress vs the baseline."""
+    cocotb.start_soon(Clock(dut.clk, 10, "ns").start())
+
+    results = {}
+    for gap_prob in GAP_PROBS:
+        for ready in READY_PATTERNS:
+            rec = await run_config(dut, gap_prob, ready, BENCH_DOTS, BENCH_SEED)
+            results[config_key(gap_prob, ready)] = rec
+            lat, hs = rec["latency"], rec["handshake_latency"]
+            dut._log.info(f"{config_key(gap_prob, ready):>22}: {rec['cycles_per_dot']:.3f} cyc/dot, "
+                          f"accept {rec['input_acceptance']:.3f}, "
+                          + (f"latency {lat['min']}..{lat['max']} to valid, {hs['min']}..{hs['max']} to handshake "
+                             f"over {rec['delivered']} delivered, " if lat else "")
+                          + f"dropped {rec['dropped']}")
+
+    report = {"dots": BENCH_DOTS, "seed": BENCH_SEED, "results": results}
+    BENCH_OUT.write_text(json.dumps(report, indent=1))
+
+    if BENCH_UPDATE:
+        BENCH_BASELINE.write_text(json.dumps(
+            {"dots": BENCH_DOTS, "seed": BENCH_SEED,
+             "cycles_per_dot": {k: r["cycles_per_dot"] for k, r in results.items()}}, indent=1))
+        return
+
+    assert results[config_key(0.0, "always")]["bit_exact"], "full-rate run is not bit-exact"
+    if not BENCH_BASELINE.exists():
+        dut._log.warning(f"no baseline at {BENCH_BASELINE}; run with BENCH_UPDATE=1 to record one")
+        return
+    base = json.loads(BENCH_BASELINE.read_text())
+    if (base["dots"], base["seed"]) != (BENCH_DOTS, BENCH_SEED):
+        dut._log.warning("baseline was recorded with different BENCH_DOTS/BENCH_SEED; not compared")
+        return
+    regressed = [f"{k}: {r['cycles_per_dot']:.4f} > baseline {base['cycles_per_dot'][k]:.4f}"
+                 for k, r in results.items()
+                 if k in base["cycles_per_dot"] and r["cycles_per_dot"] is not None
+                 and r["cycles_per_dot"] > base["cycles_per_dot"][k] * (1.0 + BENCH_TOL) + 1e-9]
+    assert not regressed, "cycles per dot regressed:\n  " + "\n  ".join(regressed)
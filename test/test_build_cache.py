@@ -0,0 +1,121 @@
+"""
+Unit tests for build_cache.py: lookup, publish and prune on a private cache
+directory. Pure Python, no simulator:
+
+    python -m pytest -q test_build_cache.py
+"""
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+import build_cache
+from build_cache import OWNER, STAGING, STAMP, build_dir, entries, prune, prune_staging, publish
+
+IMAGE = ("sim.vvp",)
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    """A private CACHE_DIR and one source file; returns the source path."""
+    monkeypatch.setattr(build_cache, "CACHE_DIR", tmp_path / "cache")
+    src = tmp_path / "top.v"
+    src.write_text("module top; endmodule\n")
+    return src
+
+def dead_pid() -> int:
+    proc = subprocess.Popen([sys.executable, "-c", "pass"])
+    proc.wait()
+    return proc.pid
+
+def build(src, sim="fake", fresh=False, owner=None, text="image"):
+    """build_dir + compile (write the image) + publish, like one make run."""
+    staging = build_dir(sim, ["-DX"], [src], IMAGE, fresh=fresh, owner=owner)
+    (staging / IMAGE[0]).write_text(text)
+    return staging, publish(staging)
+
+# ---------------- build_dir ----------------
+def test_miss_returns_owned_staging(cache):
+    staging = build_dir("fake", ["-DX"], [cache], IMAGE, owner=os.getpid())
+    assert STAGING in staging.name and staging.is_dir()
+    assert (staging / STAMP).is_file()
+    assert (staging / OWNER).read_text() == str(os.getpid())
+
+def test_hit_after_publish(cache):
+    _, final = build(cache, owner=os.getpid())
+    assert STAGING not in final.name
+    assert build_dir("fake", ["-DX"], [cache], IMAGE) == final
+
+def test_key_covers_args_and_sources(cache):
+    _, final = build(cache)
+    assert build_dir("fake", ["-DY"], [cache], IMAGE) != final
+    cache.write_text("module top; wire w; endmodule\n")
+    assert build_dir("fake", ["-DX"], [cache], IMAGE) != final
+
+def test_missing_image_is_a_miss(cache):
+    _, final = build(cache)
+    (final / IMAGE[0]).unlink()
+    assert STAGING in build_dir("fake", ["-DX"], [cache], IMAGE).name
+
+# ---------------- publish ----------------
+def test_publish_leaves_symlink(cache):
+    staging, final = build(cache)
+    assert staging.is_symlink() and staging.resolve() == final.resolve()
+    assert publish(staging) == staging          # second publish is a no-op
+
+def test_concurrent_build_keeps_private_copy(cache):
+    first = build_dir("fake", ["-DX"], [cache], IMAGE)
+    second = build_dir("fake", ["-DX"], [cache], IMAGE)
+    for staging in (first, second):
+        (staging / IMAGE[0]).write_text("image")
+    final = publish(first)
+    assert publish(second) == second            # first publish wins
+    assert (final / IMAGE[0]).is_file()
+
+def test_fresh_replaces_published_entry(cache):
+    _, final = build(cache, text="old")
+    staging = build_dir("fake", ["-DX"], [cache], IMAGE, fresh=True)
+    assert staging != final                     # make -B never reuses the entry
+    (staging / IMAGE[0]).write_text("new")
+    assert publish(staging) == final
+    assert (final / IMAGE[0]).read_text() == "new"
+    assert not list(build_cache.CACHE_DIR.glob("*replaced-*"))   # the old build is gone
+
+# ---------------- prune ----------------
+def test_prune_staging_by_owner(cache):
+    live = build_dir("fake", ["-DX"], [cache], IMAGE, owner=os.getpid())
+    dead = build_dir("fake", ["-DX"], [cache], IMAGE, owner=dead_pid())
+    assert prune_staging() == [dead]
+    assert live.is_dir() and not dead.exists()
+
+def test_lookup_removes_abandoned_staging(cache):
+    abandoned = build_dir("fake", ["-DX"], [cache], IMAGE, owner=dead_pid())   # a run that never built
+    build_dir("fake", ["-DX"], [cache], IMAGE, owner=os.getpid())
+    assert not abandoned.exists()
+
+def test_prune_staging_symlink_follows_entry_owner(cache):
+    staging, final = build(cache, owner=dead_pid())
+    assert prune_staging() == [staging]
+    assert final.is_dir()                       # the published entry stays
+
+def test_prune_staging_without_owner_uses_ttl(cache):
+    staging = build_dir("fake", ["-DX"], [cache], IMAGE)
+    assert prune_staging() == []
+    old = time.time() - build_cache.STAGING_TTL - 60
+    os.utime(staging, (old, old))
+    assert prune_staging() == [staging]
+
+def test_prune_keeps_most_recent_per_sim(cache):
+    finals = []
+    for define in ("-DA", "-DB", "-DC"):
+        staging = build_dir("fake", [define], [cache], IMAGE)
+        (staging / IMAGE[0]).write_text("image")
+        finals.append(publish(staging))
+    _, other = build(cache, sim="other")
+    for age, final in enumerate(reversed(finals)):
+        t = time.time() - 100 * age
+        os.utime(final / STAMP, (t, t))
+    removed = prune(keep=1)
+    assert finals[0] in removed and finals[1] in removed
+    assert {e[0] for e in entries()} == {finals[2], other}
@@ -0,0 +1,48 @@
+"""
+Unit tests for the ex_dse.py scoring. Pure Python, no simulator:
+
+    python -m pytest -q test_ex_dse.py
+"""
+import numpy as np
+
+from ex_dse import ExConfig, evaluate, from_mac, mac_codes
+from ex_model import ex_table
+
+# ---------------- MAC codes -> unit input ----------------
+FROM_MAC_CASES = [
+    # x6,  in_frac, expected
+    (37,   6,   37),
+    (37,   5,   18),    # 0.578 -> 0.5625: LSB dropped
+    (37,   4,    9),
+    (-37,  5,  -19),    # >>> floors negative codes
+    (-37,  4,  -10),
+    (-128, 4,  -32),
+    (127,  4,   31),
+]
+
+def test_from_mac():
+    for x6, in_frac, want in FROM_MAC_CASES:
+        got = int(from_mac(x6, ExConfig(in_frac=in_frac)))
+        assert got == want, f"from_mac({x6}, in_frac={in_frac}) = {got}, expected {want}"
+
+def test_default_scores_ex_table():
+    """in_frac = 6 sees the MAC codes unchanged, so ex.v is scored on exactly its own table."""
+    x6 = mac_codes()
+    ref = np.exp(x6 / 64.0)
+    want = np.abs(ex_table()[x6 & 0xFF] / 64.0 - ref).max()
+    assert evaluate(ExConfig())["max_abs_err"] == want
+
+# ---------------- truncated inputs cost accuracy ----------------
+BASE_CONFIGS = [
+    ExConfig(),                                   # ex.v
+    ExConfig(degree=3, k_inv=10, out_frac=7),     # cubic, finer constants and output
+]
+
+def test_lower_in_frac_increases_error():
+    """Every config is scored against exp of the Q1.6 code, so dropping input bits is not free."""
+    for base in BASE_CONFIGS:
+        full = evaluate(base._replace(in_frac=6))
+        cut = evaluate(base._replace(in_frac=4))
+        for metric in ("max_abs_err", "mean_abs_err"):
+            assert cut[metric] > full[metric], \
+                f"{base}: {metric} {cut[metric]:.4f} at in_frac=4 is not above {full[metric]:.4f} at in_frac=6"
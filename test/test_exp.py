@@ -1,28 +1,65 @@
+import os
+from pathlib import Path
+
 import cocotb
 from cocotb.triggers import Timer
 import numpy as np
-import matplotlib.pyplot as plt
+
+from ex_gen import reference_table
+from fixedpoint import Q1_6, Fixed
+from vector_store import EX_SRC, rtl_hash, write_vectors
+from waves import open_window
 
 OUT_FRAC = 6   # 6 for UQ3.6, 5 for UQ3.5
 OUT_MASK = 0x1FF  # 9-bit for UQ3.6; use 0xFF for 8-bit
 
+CACHE_DIR = Path(__file__).resolve().parent / "sim_build" / "ex_sweep"
+
+# ---------- helpers ----------
+def cache_path() -> Path:
+    """Cached 256-code response, keyed by the content of the compiled ex source (EX_SRC)."""
+    return CACHE_DIR / f"ex_{rtl_hash((EX_SRC,))}.npy"
+
+async def sweep_codes(dut, codes: np.ndarray) -> np.ndarray:
+    """Drive each code once on mac_result, return the raw 9-bit responses."""
+    out = np.empty(len(codes), dtype=np.int64)
+    for idx, code in enumerate(codes):
+        dut.mac_result.value = int(code) & 0xFF   # drive 8-bit bus correctly
+        await Timer(1, "ns")                      # allow settle
+        out[idx] = int(dut.ex_result.value) & OUT_MASK
+    return out
+
+async def ex_response(dut) -> np.ndarray:
+    """
+    256-code ex() response indexed by the unsigned 8-bit code.
+    Simulated once per revision of EX_SRC, then served from the cache
+    (set EX_SWEEP_FORCE=1 to re-simulate anyway).
+    """
+    path = cache_path()
+    if path.exists() and os.environ.get("EX_SWEEP_FORCE", "0") != "1":
+        dut._log.info(f"ex() response cache hit: {path.name}")
+        return np.load(path)
+
+    response = await sweep_codes(dut, np.arange(256))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp.npy")
+    np.save(tmp, response)
+    tmp.replace(path)
+    return response
+
 @cocotb.test()
 async def test_ex(dut):
+    """Check the 256-code response against the model EX_SRC was built from; the grid goes to ex_sweep.tvec."""
+    open_window(dut)
     x = np.arange(-2.0, 2.0 + 1e-4, 1e-4)
-    approx_array = np.empty_like(x, dtype=float)
-    real_array   = np.exp(x)
-
-    for idx, val in enumerate(x):
-        q16 = int(np.clip(np.round(val * 64.0), -128, 127))
-        dut.mac_result.value = q16 & 0xFF       # drive 8-bit bus correctly
 
-        await Timer(1, "ns")                    # allow settle
+    # The bus is 8 bits: map the dense grid onto its codes, simulate each code once
+    q16 = Fixed.from_real(x, Q1_6).raw
+    response = await ex_response(dut)
 
-        y_bits = int(dut.ex_result.value) & OUT_MASK
-        approx_array[idx] = y_bits / (2.0 ** OUT_FRAC)
+    mismatch = np.flatnonzero(response != reference_table(EX_SRC))
+    assert mismatch.size == 0, \
+        f"ex() RTL != model at codes {[f'0x{c:02X}' for c in mismatch[:16]]}"
 
-    np.savetxt("approx_array.txt", approx_array)
-    error = np.abs(approx_array - real_array)
-    plt.plot(x, error, label="|approx - exp(x)|")
-    plt.legend(); plt.xlabel("x"); plt.ylabel("error"); plt.grid(True)
-    plt.savefig("ex_error.png", dpi=150)
+    write_vectors("ex_sweep.tvec", q16, response[q16 & 0xFF], kind="ex_grid",
+                  x_start=-2.0, x_step=1e-4, out_frac=OUT_FRAC, rtl_hash=rtl_hash((EX_SRC,)))
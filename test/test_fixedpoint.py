@@ -0,0 +1,115 @@
+"""
+Unit tests for the fixedpoint.py helpers the models share. Pure Python, no
+simulator:
+
+    python -m pytest -q test_fixedpoint.py
+
+Each table row is (input, args, expected) with the expected codes written
+out by hand from the Verilog the helper mirrors.
+"""
+from fixedpoint import Q0_7, Q1_6, Q1_15, UQ3_6, Fixed, QFormat, bit_slice, round_shift, saturate, wrap
+
+# ---------------- wrap: Verilog N'(v) ----------------
+WRAP_CASES = [
+    # v,     bits, signed, expected
+    (127,     8, True,   127),
+    (128,     8, True,  -128),
+    (255,     8, True,    -1),
+    (256,     8, True,     0),
+    (-129,    8, True,   127),
+    (300,     8, False,   44),
+    (-1,      9, False, 0x1FF),
+    (0b101,   3, True,    -3),   # n_round = 3'(n_full)
+]
+
+def test_wrap():
+    for v, bits, signed, want in WRAP_CASES:
+        got = int(wrap(v, bits, signed))
+        assert got == want, f"wrap({v}, {bits}, signed={signed}) = {got}, expected {want}"
+
+# ---------------- round_shift: +/-half then >>> ----------------
+ROUND_SHIFT_CASES = [
+    # v,  s, expected     v / 2^s
+    (5,   2,  1),        #  1.25
+    (6,   2,  2),        #  1.5   tie, up
+    (7,   2,  2),        #  1.75
+    (4,   2,  1),        #  1.0
+    (0,   2,  0),
+    (-2,  2, -1),        # -0.5   tie, away from zero
+    (-6,  2, -2),        # -1.5   tie, away from zero
+    (-1,  2, -1),        # -0.25  floor(x - 1/2): one below nearest
+    (-5,  2, -2),        # -1.25
+    (-7,  2, -3),        # -1.75
+    (-4,  2, -2),        # -1.0   exact values go down one as well
+    (3,   0,  3),        # s = 0: unchanged
+    (-3, -2, -12),       # s < 0: left shift
+]
+
+def test_round_shift():
+    for v, s, want in ROUND_SHIFT_CASES:
+        got = int(round_shift(v, s))
+        assert got == want, f"round_shift({v}, {s}) = {got}, expected {want}"
+
+# ---------------- bit_slice: v[hi:lo] ----------------
+BIT_SLICE_CASES = [
+    # v,           hi, lo, signed, expected
+    (0b1011_0110,  7,  4, False,  0b1011),
+    (0b1011_0110,  7,  4, True,   -5),
+    (0b1011_0110,  3,  0, False,  0b0110),
+    (-1,           3,  0, False,  15),
+    (0x1_8000,    16,  9, True,   -64),   # mac_div2[16:9] as $signed
+    (0x0_8000,    16,  9, True,    64),
+]
+
+def test_bit_slice():
+    for v, hi, lo, signed, want in BIT_SLICE_CASES:
+        got = int(bit_slice(v, hi, lo, signed))
+        assert got == want, f"bit_slice({v:#x}, {hi}, {lo}, signed={signed}) = {got}, expected {want}"
+
+# ---------------- saturate: clamp to the field ----------------
+SATURATE_CASES = [
+    # v,     bits, signed, expected
+    (127,     8, True,   127),
+    (128,     8, True,   127),
+    (-128,    8, True,  -128),
+    (-129,    8, True,  -128),
+    (10**6,   8, True,   127),
+    (-10**6,  8, True,  -128),
+    (-1,      8, False,    0),
+    (0,       8, False,    0),
+    (255,     8, False,  255),
+    (256,     8, False,  255),
+    (0x200,   9, False, 0x1FF),   # ex() output clamp
+]
+
+def test_saturate():
+    for v, bits, signed, want in SATURATE_CASES:
+        got = int(saturate(v, bits, signed))
+        assert got == want, f"saturate({v}, {bits}, signed={signed}) = {got}, expected {want}"
+
+# ---------------- Fixed.cast ----------------
+Q1_4   = QFormat(1, 4)
+UQ2_6  = QFormat(2, 6, signed=False)
+CAST_CASES = [
+    # raw,  from,  to,    overflow,    expected
+    (100,   Q1_6,  Q1_4,  "wrap",       25),     # drop two fraction bits: 1.5625 -> 1.5625
+    (-100,  Q1_6,  Q1_4,  "wrap",      -25),
+    (3,     Q1_6,  Q1_4,  "wrap",        0),     # truncation is >>>, toward -inf
+    (-3,    Q1_6,  Q1_4,  "wrap",       -1),
+    (5,     Q0_7,  Q1_15, "wrap",     1280),     # widen: 8 fraction bits more
+    (100,   Q1_6,  Q0_7,  "wrap",      -56),     # 200 wraps in 8 bits
+    (100,   Q1_6,  Q0_7,  "saturate",  127),
+    (-100,  Q1_6,  Q0_7,  "saturate", -128),
+    (0x1FF, UQ3_6, UQ2_6, "wrap",      255),
+    (0x1FF, UQ3_6, UQ2_6, "saturate",  255),
+    (0x100, UQ3_6, UQ2_6, "wrap",        0),
+    (0x100, UQ3_6, UQ2_6, "saturate",  255),
+    (-1,    Q1_6,  UQ3_6, "wrap",     0x1FF),    # signed -> unsigned reads the bits
+    (-1,    Q1_6,  UQ3_6, "saturate",    0),
+]
+
+def test_fixed_cast():
+    for raw, src, dst, overflow, want in CAST_CASES:
+        out = Fixed(raw, src).cast(dst, overflow)
+        assert out.fmt == dst
+        assert int(out.raw) == want, f"Fixed({raw}, {src}).cast({dst}, {overflow!r}) = {int(out.raw)}, expected {want}"
@@ -0,0 +1,116 @@
+import json
+import os
+
+import cocotb
+from cocotb.clock import Clock
+from cocotb.triggers import ClockCycles, with_timeout
+import numpy as np
+
+from ex_coverage import ExCoverage, directed_stimulus
+from ex_model import ex_lookup
+from harness import OutputMonitor, Scoreboard, StreamDriver, reset
+from mac_model import mac_path_batch
+from vector_store import VectorStore, rtl_hash
+from profiling import profiled
+from tx_trace import TraceRecorder, save_trace
+from waves import Waves
+
+# One shard of a sharded regression (see run_regression.py); knobs come from the environment
+FUZZ_SEED   = int(os.environ.get("FUZZ_SEED", "123"))
+FUZZ_DOTS   = int(os.environ.get("FUZZ_DOTS", "1000"))
+FUZZ_REPORT = os.environ.get("FUZZ_REPORT", "")
+FUZZ_DIRECTED = os.environ.get("FUZZ_DIRECTED", "1") == "1"
+FUZZ_VECTORS = os.environ.get("FUZZ_VECTORS", "")   # replay a .tvec golden set instead
+FUZZ_TRACE  = os.environ.get("FUZZ_TRACE", "")      # record a transaction trace for GL replay
+FUZZ_CHUNK  = 1 << 14
+
+def fuzz_vectors(seed: int, dots: int, directed: bool = False) -> np.ndarray:
+    """
+    (dots, 4, 2) uniform int8 Q0.7 codes; fully determined by the seed.
+    With directed, the first dots are the coverage-closing index (ex_coverage.py).
+    """
+    rng = np.random.default_rng(seed)
+    pairs = rng.integers(-128, 128, size=(dots, 4, 2)) & 0xFF
+    if directed:
+        head = directed_stimulus()[:dots]
+        pairs[:len(head)] = head
+    return pairs
+
+@cocotb.test()
+@profiled
+async def test_fuzz_shard(dut):
+    """FUZZ_DOTS random dots from FUZZ_SEED, streamed back-to-back and checked bit-exact."""
+    cocotb.start_soon(Clock(dut.clk, 10, "ns").start())
+    waves = Waves(dut)
+    pins = await reset(dut)
+    pins.rdy_mst_in = 1  # always ready
+
+    pairs_q = fuzz_vectors(FUZZ_SEED, FUZZ_DOTS, FUZZ_DIRECTED)
+    x_q16 = mac_path_batch(pairs_q).mac_reduced
+    cov = ExCoverage()
+    cov.sample(x_q16)
+    scoreboard = Scoreboard(ex_lookup(x_q16), x_q16=x_q16)
+
+    recorder = TraceRecorder(pins) if FUZZ_TRACE else None
+    monitor = OutputMonitor(pins)
+    driver = StreamDriver(pins)
+    driver.send(pairs_q)
+    got = await with_timeout(monitor.collect(FUZZ_DOTS), 200 * FUZZ_DOTS + 1000, "ns")
+    driver.stop()
+    monitor.stop()
+    if recorder is not None:
+        await ClockCycles(pins.clk, 2)   # the last handshake's falling edge
+        save_trace(FUZZ_TRACE, recorder.stop(seed=FUZZ_SEED, dots=FUZZ_DOTS, rtl_hash=rtl_hash()))
+
+    if FUZZ_REPORT:
+        report = {"seed": FUZZ_SEED, "dots": FUZZ_DOTS, "coverage": cov.report(),
+                  **scoreboard.summary(got, pairs_q)}
+        with open(FUZZ_REPORT, "w") as f:
+            json.dump(report, f, indent=1)
+    bad = scoreboard.mismatches(got)
+    dut._log.info(f"seed={FUZZ_SEED} dots={FUZZ_DOTS} mismatches={bad.size} coverage: {cov.summary()}")
+
+    async def rerun(idx):
+        """The failing dot alone, from reset (waves are on meanwhile in WAVES=fail)."""
+        pins = await reset(dut)
+        pins.rdy_mst_in = 1
+        monitor = OutputMonitor(pins)
+        driver = StreamDriver(pins)
+        driver.send(pairs_q[idx])
+        await with_timeout(monitor.collect(1), 1000, "ns")
+        driver.stop()
+        monitor.stop()
+
+    await waves.capture_failures(rerun, bad[bad < min(len(got), FUZZ_DOTS)].tolist())
+    scoreboard.check(got)
+
+@cocotb.test(skip=not FUZZ_VECTORS)
+@profiled
+async def test_fuzz_vectors(dut):
+    """Replay the golden dots in FUZZ_VECTORS, streamed from the memory-mapped store in chunks."""
+    store = VectorStore(FUZZ_VECTORS)
+    if not store.check_rtl():
+        dut._log.warning(f"{store.path.name} was recorded against different RTL sources")
+    cocotb.start_soon(Clock(dut.clk, 10, "ns").start())
+    pins = await reset(dut)
+    pins.rdy_mst_in = 1  # always ready
+
+    monitor = OutputMonitor(pins)
+    driver = StreamDriver(pins)
+    cov = ExCoverage()
+    bad = 0
+    for start, pairs, expected in store.chunks(FUZZ_CHUNK):
+        driver.send(pairs)
+        got = await with_timeout(monitor.collect(len(pairs)), 200 * len(pairs) + 1000, "ns")
+        x_q16 = mac_path_batch(pairs).mac_reduced
+        cov.sample(x_q16)
+        scoreboard = Scoreboard(expected, x_q16=x_q16)
+        miss = scoreboard.mismatches(got).size
+        if miss:
+            dut._log.error(f"chunk at dot {start}: {scoreboard.report(got)}")
+        bad += miss
+    driver.stop()
+    monitor.stop()
+
+    dut._log.info(f"{store.path.name}: {len(store)} dots mismatches={bad} coverage: {cov.summary()}")
+    assert bad == 0, f"{bad} mismatches replaying {store.path}"
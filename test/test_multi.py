@@ -0,0 +1,81 @@
+"""
+Multi-instance runs: one simulator process, N copies of the design under
+tb.lane[i] (make INSTANCES=N), each fed its own vector shard by an
+independent driver / monitor pair. Elaboration and startup are paid once
+for N times the vectors per simulated cycle:
+
+    make COCOTB_TEST_MODULES=test_multi INSTANCES=8 MULTI_DOTS=20000
+    make COCOTB_TEST_MODULES=test_multi INSTANCES=16 EX_ONLY=yes
+
+Lane i uses seed MULTI_SEED + i, so a failing lane's shard can be re-run on
+its own (test_fuzz.py with FUZZ_SEED=MULTI_SEED + i, FUZZ_DIRECTED=0).
+"""
+import os
+
+import cocotb
+from cocotb.clock import Clock
+from cocotb.triggers import Combine, Timer, with_timeout
+import numpy as np
+
+from ex_model import ex_lookup, ex_table
+from harness import OutputMonitor, Scoreboard, StreamDriver, lane_count, lane_pins, reset
+from mac_model import mac_path_batch
+from profiling import profiled
+from waves import open_window
+
+MULTI_SEED = int(os.environ.get("MULTI_SEED", "123"))
+MULTI_DOTS = int(os.environ.get("MULTI_DOTS", "1000"))   # per lane
+LANES      = lane_count()
+EX_ONLY    = os.environ.get("EX_ONLY", "") == "yes"
+
+async def run_lane(pins, pairs_q):
+    """Stream one lane's shard and return everything its monitor collected."""
+    monitor = OutputMonitor(pins)
+    driver = StreamDriver(pins)
+    driver.send(pairs_q)
+    got = await with_timeout(monitor.collect(len(pairs_q)), 200 * len(pairs_q) + 1000, "ns")
+    driver.stop()
+    monitor.stop()
+    return got
+
+@cocotb.test(skip=LANES == 0 or EX_ONLY)
+@profiled
+async def test_multi_fuzz(dut):
+    """MULTI_DOTS random dots per lane on every lane at once, each checked bit-exact."""
+    cocotb.start_soon(Clock(dut.clk, 10, "ns").start())
+    lanes = lane_pins(dut)
+    await reset(dut)
+    for pins in lanes:
+        pins.rdy_mst_in = 1  # always ready
+
+    shards = [np.random.default_rng(MULTI_SEED + i).integers(-128, 128, size=(MULTI_DOTS, 4, 2)) & 0xFF
+              for i in range(LANES)]
+    tasks = [cocotb.start_soon(run_lane(pins, pairs_q)) for pins, pairs_q in zip(lanes, shards)]
+    await Combine(*tasks)
+
+    failed = []
+    for i, (task, pairs_q) in enumerate(zip(tasks, shards)):
+        x_q16 = mac_path_batch(pairs_q).mac_reduced
+        scoreboard = Scoreboard(ex_lookup(x_q16), x_q16=x_q16)
+        got = task.result()
+        if scoreboard.mismatches(got).size:
+            failed.append(f"lane {i} (seed {MULTI_SEED + i}): {scoreboard.report(got)}")
+    dut._log.info(f"{LANES} lanes x {MULTI_DOTS} dots, {len(failed)} failing lanes")
+    assert not failed, "\n".join(failed)
+
+@cocotb.test(skip=LANES == 0 or not EX_ONLY)
+async def test_multi_ex(dut):
+    """All 256 ex() codes spread over the lanes' ex instances, ceil(256 / N) settle steps."""
+    open_window(dut)
+    codes = np.arange(256)
+    steps = -(-len(codes) // LANES)
+    got = np.zeros(len(codes), dtype=np.int64)
+    for step in range(steps):
+        batch = codes[step * LANES:(step + 1) * LANES]
+        for i, code in enumerate(batch.tolist()):
+            dut.lane[i].mac_result.value = code
+        await Timer(1, "ns")
+        for i in range(len(batch)):
+            got[step * LANES + i] = int(dut.lane[i].ex_result.value) & 0x1FF
+    bad = np.flatnonzero(got != ex_table())
+    assert bad.size == 0, f"ex() RTL != model at codes {[f'0x{c:02X}' for c in bad[:16]]}"
@@ -1,7 +1,11 @@
 import cocotb
 from cocotb.clock import Clock
 from cocotb.triggers import RisingEdge, Timer
-import numpy as np
+
+from ex_model import ex_lookup
+from fixedpoint import Q0_7, Q1_6, UQ3_6, Fixed
+from harness import TTPins
+from mac_model import mac_path_batch
 
 # ---------------- utils ----------------
 def signext(v: int, bits: int) -> int:
@@ -11,17 +15,6 @@ def signext(v: int, bits: int) -> int:
     s = 1 << (bits - 1)
     return (v ^ s) - s
 
-def encode_q0_7(x: float) -> int:
-    q = int(np.round(x * 128.0))
-    return int(np.clip(q, -128, 127)) & 0xFF
-
-def decode_uq3_6(lo8: int, hi1: int) -> float:
-    raw = ((hi1 & 1) << 8) | (lo8 & 0xFF)
-    return raw / 64.0
-
-def set_bit(val: int, bit: int, one: bool) -> int:
-    return (val | (1 << bit)) if one else (val & ~(1 << bit))
-
 # ---------------- exact RTL model of ex(.): mirrors your Verilog ----------------
 def ex_logic_model_q(x_s8: int) -> int:
     """
@@ -93,123 +86,93 @@ def ex_logic_model_q(x_s8: int) -> int:
     return uq36_pre & 0x1FF
 
 # ---------------- DUT helpers ----------------
-async def reset(dut, cycles=5):
+async def reset(dut, cycles=5) -> TTPins:
+    pins = TTPins(dut)
     dut.rst_n.value = 0
-    dut.uio_in.value = 0
-    dut.ui_in.value = 0
     await Timer(1, "ns")
     for _ in range(cycles):
         await RisingEdge(dut.clk)
     dut.rst_n.value = 1
     for _ in range(cycles):
         await RisingEdge(dut.clk)
+    return pins
 
-async def feed_term(dut, a_q07: int, b_q07: int):
+async def feed_term(pins: TTPins, a_q07: int, b_q07: int):
     """Send one 2-beat term with vld held high across both beats.
        Expects RDY=1 in FIRST (for A) and again in WAIT4SECOND (for B)."""
     # deassert vld, clear data
-    dut.uio_in.value = set_bit(int(dut.uio_in.value), 0, False)
-    dut.ui_in.value = 0
-    await RisingEdge(dut.clk)
+    pins.drive(data=0, vld_slv_in=0)
+    await RisingEdge(pins.clk)
 
     # --- Beat 1 (A) ---
     # Wait until DUT is ready in FIRST
-    while ((int(dut.uio_out.value) >> 1) & 1) == 0:
-        await RisingEdge(dut.clk)
+    while not pins.sample().rdy_slv_out:
+        await RisingEdge(pins.clk)
 
     # Present A and assert vld
-    dut.ui_in.value = a_q07
-    dut.uio_in.value = set_bit(int(dut.uio_in.value), 0, True)
-    await RisingEdge(dut.clk)  # A captured; DUT transitions to WAIT4SECOND
+    pins.drive(data=a_q07, vld_slv_in=1)
+    await RisingEdge(pins.clk)  # A captured; DUT transitions to WAIT4SECOND
 
     # --- Beat 2 (B) ---
     # Now wait again for RDY=1 in WAIT4SECOND
-    while ((int(dut.uio_out.value) >> 1) & 1) == 0:
-        await RisingEdge(dut.clk)
+    while not pins.sample().rdy_slv_out:
+        await RisingEdge(pins.clk)
 
     # Present B while keeping vld high
-    dut.ui_in.value = b_q07
-    await RisingEdge(dut.clk)  # B captured; DUT transitions to READY (does MAC)
+    pins.data = b_q07
+    await RisingEdge(pins.clk)  # B captured; DUT transitions to READY (does MAC)
 
     # Deassert vld and clear data
-    dut.uio_in.value = set_bit(int(dut.uio_in.value), 0, False)
-    dut.ui_in.value = 0
+    pins.drive(data=0, vld_slv_in=0)
 
 
-async def drain_output(dut):
-    dut.uio_in.value = set_bit(int(dut.uio_in.value), 3, True)
-    await RisingEdge(dut.clk)
-    dut.uio_in.value = set_bit(int(dut.uio_in.value), 3, False)
+async def drain_output(pins: TTPins):
+    pins.rdy_mst_in = 1
+    await RisingEdge(pins.clk)
+    pins.rdy_mst_in = 0
 
-async def wait_for_valid(dut, cycles=200):
+async def wait_for_valid(pins: TTPins, cycles=200):
     for _ in range(cycles):
-        await RisingEdge(dut.clk)
-        if ((int(dut.uio_out.value) >> 2) & 1) == 1:
+        await RisingEdge(pins.clk)
+        if pins.sample().vld_mst_out:
             return
     assert False, "Timeout waiting for vld_mst_out_w=1"
-def sclip(v: int, bits: int) -> int:
-    """Wrap to 'bits'-wide signed two's-complement."""
-    v &= (1 << bits) - 1
-    s = 1 << (bits - 1)
-    return (v ^ s) - s
-
-def rtl_reduce_mac_to_q1_6(mac_sum_int: int) -> int:
-    """
-    Emulate RTL path:
-      mac_reg: 17-bit signed accumulator (Q2.14)
-      mac_div2 = arithmetic >>>1 -> Q1.15
-      mac_reduced = mac_div2[16:9] -> 8-bit signed Q1.6
-    Returns int8 value (two's-complement) as Python int in [-128,127].
-    """
-    mac17    = sclip(mac_sum_int, 17)          # wrap to 17b signed like the reg
-    mac_div2 = sclip(mac17 >> 1, 17)           # arithmetic >>>1 (keep 17b)
-    x_s8     = np.int8((mac_div2 >> 9) & 0xFF).item()  # slice [16:9] -> int8
-    return x_s8
-
 def mac_path_reference(pairs_q):
-    prods = []
-    for aq, bq in pairs_q:
-        a = np.int8(aq).item()
-        b = np.int8(bq).item()
-        prods.append(int(a) * int(b))
-
-    mac_sum = int(np.int32(np.sum(prods)))     # 4 terms, fits 17b signed
-    x_s8 = rtl_reduce_mac_to_q1_6(mac_sum)     # EXACTLY like RTL wiring
-
-    # For logging: convert int8 Q1.6 to integer/floating representations
-    x_fixed = signext(x_s8, 8)                 # still Q1.6 integer in [-128,127]
-    x_real  = x_fixed / 64.0
+    """Single-dot view of mac_path_batch(): EXACTLY like RTL wiring."""
+    path = mac_path_batch(pairs_q)
+    mac_sum = int(path.mac_sum)
+    x_fixed = int(path.mac_reduced)            # Q1.6 integer in [-128,127]
+    x_real  = float(Fixed(x_fixed, Q1_6).real)
 
-    return mac_sum, x_fixed, x_real, x_s8
+    return mac_sum, x_fixed, x_real
 
 
-def read_dut_y(dut):
-    lo8 = int(dut.uo_out.value) & 0xFF
-    hi1 = (int(dut.uio_out.value) >> 4) & 1
-    raw9 = ((hi1 & 1) << 8) | lo8
-    return raw9, raw9 / 64.0
+def read_dut_y(pins: TTPins):
+    raw9 = pins.sample().result
+    return raw9, float(Fixed(raw9, UQ3_6).real)
 
 # ---------------- minimal test to compare DUT vs model ----------------
 @cocotb.test()
 async def test_single_dot_exp(dut):
     """Feed one dot (4 terms), compare DUT vs bit-accurate model (not vs float)."""
     cocotb.start_soon(Clock(dut.clk, 10, "ns").start())
-    await reset(dut)
-    dut.uio_in.value = set_bit(int(dut.uio_in.value), 3, True)
+    pins = await reset(dut)
+    pins.rdy_mst_in = 1
 
     # same vector that showed 0x03A vs 0x038 before
     pairs_real = [(-0.75, 0.50), (0.25, -0.50), (0.60, 0.40), (-0.30, 0.20)]
-    pairs_q = [(encode_q0_7(a), encode_q0_7(b)) for a, b in pairs_real]
+    pairs_q = Fixed.from_real(pairs_real, Q0_7).bus.tolist()
     for (aq, bq) in pairs_q:
-        await feed_term(dut, aq, bq)
+        await feed_term(pins, aq, bq)
 
-    await wait_for_valid(dut)
-    dut_raw, y_dut = read_dut_y(dut)
-    await drain_output(dut)
+    await wait_for_valid(pins)
+    dut_raw, y_dut = read_dut_y(pins)
+    await drain_output(pins)
 
-    _, x_fixed, x_real, x_s8 = mac_path_reference(pairs_q)
-    model_raw = ex_logic_model_q(x_s8)
-    y_model = model_raw / 64.0
+    _, x_fixed, x_real = mac_path_reference(pairs_q)
+    model_raw = int(ex_lookup(x_fixed))
+    assert model_raw == ex_logic_model_q(x_fixed), "ex() table drifted from scalar model"
+    y_model = float(Fixed(model_raw, UQ3_6).real)
 
     dut._log.info(f"x_fixed={x_fixed} (Q1.6)  x_real={x_real:.6f}")
     dut._log.info(f"DUT:   raw=0x{dut_raw:03X}  y={y_dut:.6f}")
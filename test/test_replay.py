@@ -0,0 +1,31 @@
+import json
+import os
+
+import cocotb
+from cocotb.clock import Clock
+
+from harness import reset
+from profiling import profiled
+from tx_trace import load_trace, replay_trace
+
+# Replays a trace recorded by an RTL run (tx_trace.py); meant for GATES=yes
+TRACE_IN     = os.environ.get("TRACE_IN", "")
+TRACE_REPORT = os.environ.get("TRACE_REPORT", "")
+
+@cocotb.test(skip=not TRACE_IN)
+@profiled
+async def test_replay(dut):
+    """Drive the recorded stimulus and compare every output word and its cycle against the trace."""
+    trace = load_trace(TRACE_IN)
+    cocotb.start_soon(Clock(dut.clk, 10, "ns").start())
+    pins = await reset(dut)
+
+    summary = await replay_trace(pins, trace)
+    summary["trace"] = TRACE_IN
+    summary["recorded"] = trace.meta
+    if TRACE_REPORT:
+        with open(TRACE_REPORT, "w") as f:
+            json.dump(summary, f, indent=1)
+    dut._log.info(f"replayed {summary['beats']} beats over {summary['cycles']} cycles: "
+                  f"{summary['received']}/{summary['expected']} outputs, {summary['mismatches']} mismatches")
+    assert summary["ok"], json.dumps(summary["first_mismatches"] or summary["refused_beats"])
@@ -0,0 +1,172 @@
+"""
+Transaction-level model of tt_um_attention_top: input FSM (FIRST /
+WAIT4SECOND), count_mac / done_mac sequencing, the output latch and the
+vld / rdy handshake, evaluated over whole arrays of beats.
+
+Cycle numbering follows tx_trace.py: a beat "at cycle c" is driven during
+cycle c and taken on the rising edge that ends it. With rdy_slv_out tied
+high, every valid cycle is a beat, and dot k completes with beat 8k+7:
+  c8[k]  cycle of the 8th beat (done_mac rises on the edge that ends it)
+  v[k]   = c8[k] + 2, the first cycle the result is visible with vld high
+  h[k]   first cycle >= v[k] with rdy_mst_in high (the handshake)
+The output register holds one result. Result k is dropped unless h[k] falls
+before v[k+1], because a new result takes priority over a same-cycle
+acknowledge.
+
+run() is fully vectorized and is the reference for latency, ordering and
+drops in the scoreboard. run_buffered() explores protocol changes: an
+output FIFO of any depth with credit-based input stalls. That path is
+cycle-approximate, since a full FIFO delays the dot's completing beat, and
+it is a per-dot loop (about 0.5 M dots/s rather than millions).
+
+    python top_model.py --dots 1000000 --gap 0.25 --ready random:0.5 --depth 2
+"""
+import argparse
+import time
+from typing import NamedTuple
+
+import numpy as np
+
+from ex_model import ex_lookup
+from mac_model import mac_path_batch
+
+BEATS_PER_DOT = 8
+LATENCY       = 2   # cycles from the 8th beat to the first valid cycle
+
+class TopResult(NamedTuple):
+    dot: np.ndarray         # index of each delivered dot, in output order
+    out_cycle: np.ndarray   # handshake cycle of each delivered result
+    out_data: np.ndarray    # raw 9-bit result
+    c8: np.ndarray          # per dot: cycle of its 8th beat
+    dropped: np.ndarray     # per dot: True if overwritten, or not taken before the run ends
+
+def next_ready(rdy) -> np.ndarray:
+    """next_ready(rdy)[c] = first cycle >= c with rdy high (len(rdy) if none)."""
+    rdy = np.asarray(rdy, dtype=bool)
+    n = len(rdy)
+    idx = np.where(rdy, np.arange(n), n)
+    return np.minimum.accumulate(idx[::-1])[::-1]
+
+def dot_results(beats) -> np.ndarray:
+    """ex() output of every complete dot in a flat stream of A, B beat codes."""
+    beats = np.asarray(beats, dtype=np.int64)
+    dots = len(beats) // BEATS_PER_DOT
+    return ex_lookup(mac_path_batch(beats[:dots * BEATS_PER_DOT].reshape(dots, 4, 2)).mac_reduced)
+
+def run(beats, vld, rdy) -> TopResult:
+    """
+    beats: flat A, B codes in stream order, one per valid cycle (int8 or bus encoding)
+    vld, rdy: per-cycle vld_slv_in and rdy_mst_in over the whole run
+    """
+    vld = np.asarray(vld, dtype=bool)
+    rdy = np.asarray(rdy, dtype=bool)
+    beat_cycle = np.flatnonzero(vld)
+    results = dot_results(beats)
+    dots = min(len(results), len(beat_cycle) // BEATS_PER_DOT)
+    results = results[:dots]
+
+    c8 = beat_cycle[BEATS_PER_DOT - 1::BEATS_PER_DOT][:dots]
+    v = c8 + LATENCY
+    ready = next_ready(rdy)
+    h = ready[np.minimum(v, len(rdy) - 1)]
+    h = np.where(v < len(rdy), h, len(rdy))
+    v_next = np.append(v[1:], len(rdy))          # last result is only cut off by the end of the run
+    delivered = h < v_next
+    return TopResult(np.flatnonzero(delivered), h[delivered], results[delivered], c8, ~delivered)
+
+def run_buffered(beats, vld, rdy, depth: int = 2) -> TopResult:
+    """
+    Variant with a depth-entry output FIFO and credit flow control: when the
+    FIFO is full, the DUT holds off the completing beat of the next dot until
+    a slot frees, and every later beat slips by the same amount. Nothing is
+    overwritten. The extra wait shows up in c8 and out_cycle, and dots still
+    waiting for a handshake or a slot when the run ends are reported as
+    dropped (their c8 is len(rdy) if they never completed).
+
+    The credit recurrence is a per-dot Python loop, about 0.5 M dots/s:
+    fine for protocol what-ifs, but run() is the millions-per-second path.
+    """
+    vld = np.asarray(vld, dtype=bool)
+    beat_cycle = np.flatnonzero(vld)
+    results = dot_results(beats)
+    dots = min(len(results), len(beat_cycle) // BEATS_PER_DOT)
+    c8_nom = beat_cycle[BEATS_PER_DOT - 1::BEATS_PER_DOT][:dots].tolist()
+
+    ready = next_ready(rdy).tolist()
+    horizon = len(ready)
+
+    c8 = [horizon] * dots
+    dep = [horizon] * dots
+    shift = 0
+    last_dep = -1
+    for k in range(dots):
+        c = c8_nom[k] + shift
+        if k >= depth and dep[k - depth] > c + 1:   # slot of result k - depth frees on that handshake
+            shift += dep[k - depth] - 1 - c
+            c = dep[k - depth] - 1
+        if c >= horizon:                           # input stalled past the end of the run: so is every later dot
+            break
+        c8[k] = c
+        t = max(c + LATENCY, last_dep + 1)
+        last_dep = dep[k] = ready[t] if t < horizon else horizon
+    dep = np.array(dep, dtype=np.int64)
+    delivered = dep < horizon
+    return TopResult(np.flatnonzero(delivered), dep[delivered], results[:dots][delivered],
+                     np.array(c8, dtype=np.int64), ~delivered)
+
+def run_trace(trace) -> TopResult:
+    """run() on the stimulus of a tx_trace.Trace; compare with trace.out_cycle / out_data."""
+    vld = np.zeros(trace.cycles, dtype=bool)
+    vld[trace.beat_cycle] = True
+    rdy = np.zeros(trace.cycles, dtype=bool)
+    for c, v in zip(trace.rdy_cycle.tolist(), trace.rdy_value.tolist()):
+        rdy[c:] = bool(v)
+    return run(trace.beat_data, vld, rdy)
+
+# ---------------- stimulus ----------------
+def ready_pattern(pattern: str, cycles: int, rng) -> np.ndarray:
+    """Per-cycle rdy_mst_in for the harness.SinkReady patterns."""
+    kind, _, arg = pattern.partition(":")
+    if kind == "always":
+        return np.ones(cycles, dtype=bool)
+    if kind == "never":
+        return np.zeros(cycles, dtype=bool)
+    if kind == "random":
+        return rng.random(cycles) < float(arg)
+    if kind == "every":
+        return np.arange(cycles) % int(arg) == 0
+    raise ValueError(f"unknown ready pattern {pattern!r}")
+
+def random_valid(beats: int, gap_prob: float, rng) -> np.ndarray:
+    """Per-cycle vld_slv_in with geometric idle gaps before each beat (harness.StreamDriver)."""
+    gaps = rng.geometric(1.0 - gap_prob, size=beats) - 1 if gap_prob > 0 else np.zeros(beats, dtype=np.int64)
+    vld = np.zeros(int(gaps.sum()) + beats, dtype=bool)
+    vld[np.cumsum(gaps + 1) - 1] = True
+    return vld
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--dots", type=int, default=1_000_000)
+    ap.add_argument("--gap", type=float, default=0.0, help="idle-cycle probability before each beat")
+    ap.add_argument("--ready", default="always", help="sink pattern: always, random:<p>, every:<k>")
+    ap.add_argument("--depth", type=int, default=0, help="output FIFO depth with credits (0: RTL register)")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    beats = rng.integers(-128, 128, size=args.dots * BEATS_PER_DOT)
+    vld = random_valid(len(beats), args.gap, rng)
+    cycles = len(vld) + 64
+    vld = np.append(vld, np.zeros(64, dtype=bool))
+    rdy = ready_pattern(args.ready, cycles, rng)
+
+    start = time.perf_counter()
+    res = run_buffered(beats, vld, rdy, args.depth) if args.depth else run(beats, vld, rdy)
+    wall = time.perf_counter() - start
+    lat = res.out_cycle - res.c8[res.dot]
+    span = res.out_cycle[-1] + 1 if len(res.out_cycle) else cycles
+    print(f"{args.dots} dots in {wall:.2f} s ({args.dots / wall / 1e6:.2f} M dots/s)")
+    per_dot = f"{span / len(res.dot):.3f}" if len(res.dot) else "-"
+    print(f"delivered {len(res.dot)}, dropped {int(res.dropped.sum())}, {per_dot} cycles per delivered dot")
+    if len(lat):
+        print(f"latency (8th beat -> handshake): min {lat.min()}, mean {lat.mean():.2f}, max {lat.max()}")
@@ -0,0 +1,114 @@
+"""
+Transaction trace of one run: every accepted input beat, every output
+handshake and every change of the sink ready, each with its cycle number.
+
+An RTL run records the trace (TraceRecorder), and a gate-level run replays
+only that stimulus (replay_trace). The replay compares output words and
+their cycles against the recording. No golden model is computed on the slow
+side:
+
+    make COCOTB_TEST_MODULES=test_fuzz FUZZ_DOTS=20000 FUZZ_TRACE=$PWD/fuzz.trace.npz
+    make GATES=yes COCOTB_TEST_MODULES=test_replay TRACE_IN=$PWD/fuzz.trace.npz
+
+Both sides sample and drive on the falling clock edge. Unit-delay gate
+outputs have settled by then, so RTL and GL see the same cycle numbering.
+Cycle 0 is the first falling edge after the recorder or replayer starts,
+which both sides do right after reset().
+"""
+import json
+from typing import NamedTuple
+
+import cocotb
+import numpy as np
+from cocotb.triggers import FallingEdge, ReadOnly
+
+from harness import TTPins
+
+class Trace(NamedTuple):
+    beat_cycle: np.ndarray   # cycle of each accepted input beat
+    beat_data: np.ndarray    # ui_in of that beat
+    out_cycle: np.ndarray    # cycle of each output handshake
+    out_data: np.ndarray     # raw 9-bit result of that handshake
+    rdy_cycle: np.ndarray    # cycles where rdy_mst_in changes ...
+    rdy_value: np.ndarray    # ... to this value (first entry: value at cycle 0)
+    cycles: int              # length of the recorded run
+    meta: dict
+
+def save_trace(path, trace: Trace):
+    arrays = {k: np.asarray(v) for k, v in trace._asdict().items() if k not in ("cycles", "meta")}
+    np.savez_compressed(path, cycles=trace.cycles, meta=json.dumps(trace.meta), **arrays)
+
+def load_trace(path) -> Trace:
+    with np.load(path) as f:
+        return Trace(**{k: f[k] for k in Trace._fields if k not in ("cycles", "meta")},
+                     cycles=int(f["cycles"]), meta=json.loads(str(f["meta"])))
+
+class TraceRecorder:
+    """Samples the TT bus once per cycle (falling edge) until stop()."""
+
+    def __init__(self, pins: TTPins):
+        self.pins = pins
+        self.beats, self.outs, self.rdy = [], [], []
+        self.cycle = 0
+        self._task = cocotb.start_soon(self._run())
+
+    def stop(self, **meta) -> Trace:
+        self._task.cancel()
+        beats = np.array(self.beats, dtype=np.int64).reshape(-1, 2)
+        outs = np.array(self.outs, dtype=np.int64).reshape(-1, 2)
+        rdy = np.array(self.rdy, dtype=np.int64).reshape(-1, 2)
+        return Trace(beats[:, 0], beats[:, 1], outs[:, 0], outs[:, 1], rdy[:, 0], rdy[:, 1],
+                     self.cycle, meta)
+
+    async def _run(self):
+        pins = self.pins
+        last_rdy = None
+        while True:
+            await FallingEdge(pins.clk)
+            await ReadOnly()
+            out = pins.sample()
+            if pins.vld_slv_in and out.rdy_slv_out:
+                self.beats.append((self.cycle, pins.data))
+            if out.vld_mst_out and pins.rdy_mst_in:
+                self.outs.append((self.cycle, out.result))
+            if pins.rdy_mst_in != last_rdy:
+                last_rdy = pins.rdy_mst_in
+                self.rdy.append((self.cycle, last_rdy))
+            self.cycle += 1
+
+async def replay_trace(pins: TTPins, trace: Trace) -> dict:
+    """
+    Drive the recorded beats and ready pattern cycle by cycle, capture every
+    output handshake, and compare against the trace. Returns a summary with
+    the first mismatching handshakes; 'ok' is True on an exact match.
+    """
+    n = trace.cycles
+    data = np.zeros(n, dtype=np.int64)
+    vld = np.zeros(n, dtype=bool)
+    data[trace.beat_cycle] = trace.beat_data
+    vld[trace.beat_cycle] = True
+    rdy = np.zeros(n, dtype=np.int64)
+    for c, v in zip(trace.rdy_cycle.tolist(), trace.rdy_value.tolist()):
+        rdy[c:] = v
+    data, vld, rdy = data.tolist(), vld.tolist(), rdy.tolist()
+
+    outs, refused = [], []
+    for c in range(n):
+        await FallingEdge(pins.clk)
+        pins.drive(data=data[c] if vld[c] else None, vld_slv_in=vld[c], rdy_mst_in=rdy[c])
+        await ReadOnly()
+        out = pins.sample()
+        if vld[c] and not out.rdy_slv_out:
+            refused.append(c)
+        if out.vld_mst_out and rdy[c]:
+            outs.append((c, out.result))
+
+    got = np.array(outs, dtype=np.int64).reshape(-1, 2)
+    want = np.stack([trace.out_cycle, trace.out_data], axis=1)
+    k = min(len(got), len(want))
+    bad = np.flatnonzero((got[:k] != want[:k]).any(axis=1))
+    first = [{"index": int(i), "got": got[i].tolist(), "want": want[i].tolist()} for i in bad[:20]]
+    return {"cycles": n, "beats": len(trace.beat_cycle), "expected": len(want), "received": len(got),
+            "mismatches": int(bad.size) + abs(len(got) - len(want)), "refused_beats": refused[:20],
+            "first_mismatches": first,
+            "ok": bad.size == 0 and len(got) == len(want) and not refused}
@@ -0,0 +1,124 @@
+"""
+Versioned binary test-vector store (.tvec), memory-mapped for reading.
+
+Layout (little-endian):
+  magic   b"TTVEC"  + u8 version
+  u32     metadata length, then UTF-8 JSON metadata, zero-padded to 64 bytes
+  inputs  int8  [count, *input_shape]   packed Q-format input codes
+  outputs uint16 [count]                9-bit result codes (UQ3.6)
+The metadata records count, input_shape, the RTL source hash the outputs came
+from, the seed and any free-form fields (e.g. the x grid of the ex() sweep).
+
+Drivers and offline analysis read through VectorStore, which memory-maps
+both arrays and streams them in chunks. A golden set is generated once and
+replayed on RTL, gate-level and Verilator runs without parsing text:
+
+    python vector_store.py gen fuzz.tvec --dots 1000000 --seed 7
+    python vector_store.py info fuzz.tvec
+    make COCOTB_TEST_MODULES=test_fuzz FUZZ_VECTORS=$PWD/fuzz.tvec
+"""
+import argparse
+import hashlib
+import json
+import os
+import struct
+from pathlib import Path
+
+import numpy as np
+
+from ex_model import ex_lookup
+from mac_model import mac_path_batch
+
+MAGIC   = b"TTVEC"
+VERSION = 1
+ALIGN   = 64
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+EX_SRC  = Path(os.environ.get("TB_EX_SRC") or SRC_DIR / "ex.v")   # make EX_SRC=..., as compiled
+RTL_SOURCES = (EX_SRC, "project.v")
+
+def rtl_hash(sources=RTL_SOURCES) -> str:
+    """Content hash of the RTL the outputs were produced by (or modelled on); names are under src/."""
+    h = hashlib.sha256()
+    for name in sources:
+        h.update((SRC_DIR / name).read_bytes())
+    return h.hexdigest()[:16]
+
+def write_vectors(path, inputs, outputs, **meta) -> Path:
+    """Write a store atomically; inputs are int8 codes (any unsigned 0..255 encoding is accepted)."""
+    path = Path(path)
+    inputs = np.ascontiguousarray((np.asarray(inputs, dtype=np.int64) & 0xFF).astype(np.uint8).view(np.int8))
+    outputs = np.ascontiguousarray(np.asarray(outputs, dtype=np.int64).astype(np.uint16))
+    if len(inputs) != len(outputs):
+        raise ValueError(f"{len(inputs)} inputs vs {len(outputs)} outputs")
+    meta = {"count": len(outputs), "input_shape": list(inputs.shape[1:]), **meta}
+    blob = json.dumps(meta).encode()
+    head = MAGIC + struct.pack("<BI", VERSION, len(blob)) + blob
+    head += b"\0" * (-len(head) % ALIGN)
+
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(head)
+        f.write(inputs.tobytes())
+        f.write(outputs.tobytes())
+    tmp.replace(path)
+    return path
+
+class VectorStore:
+    """Read-only, memory-mapped view of a .tvec file."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            fixed = f.read(len(MAGIC) + 5)
+            if fixed[:len(MAGIC)] != MAGIC:
+                raise ValueError(f"{self.path}: not a test-vector store")
+            version, meta_len = struct.unpack("<BI", fixed[len(MAGIC):])
+            if version != VERSION:
+                raise ValueError(f"{self.path}: store version {version}, reader supports {VERSION}")
+            self.meta = json.loads(f.read(meta_len))
+        offset = len(fixed) + meta_len
+        offset += -offset % ALIGN
+        count = self.meta["count"]
+        shape = (count, *self.meta["input_shape"])
+        self.inputs = np.memmap(self.path, dtype=np.int8, mode="r", offset=offset, shape=shape)
+        offset += self.inputs.nbytes
+        self.outputs = np.memmap(self.path, dtype="<u2", mode="r", offset=offset, shape=(count,))
+
+    def __len__(self) -> int:
+        return self.meta["count"]
+
+    def chunks(self, size: int = 1 << 16):
+        """Yield (start, inputs, outputs) slices; only the touched pages are read."""
+        for start in range(0, len(self), size):
+            yield start, self.inputs[start:start + size], self.outputs[start:start + size]
+
+    def check_rtl(self, sources=RTL_SOURCES) -> bool:
+        """True if the stored outputs were recorded against the current RTL sources."""
+        return self.meta.get("rtl_hash") == rtl_hash(sources)
+
+# ---------------- golden dot sets ----------------
+def generate_dots(path, dots: int, seed: int, chunk: int = 1 << 20) -> Path:
+    """Uniform int8 (N, 4, 2) dots with their model ex() outputs, same stimulus as fuzz_vectors()."""
+    rng = np.random.default_rng(seed)
+    pairs = rng.integers(-128, 128, size=(dots, 4, 2))
+    outputs = np.concatenate([ex_lookup(mac_path_batch(pairs[i:i + chunk]).mac_reduced)
+                              for i in range(0, dots, chunk)]) if dots else np.empty(0, np.int64)
+    return write_vectors(path, pairs, outputs, kind="dots", seed=seed, rtl_hash=rtl_hash(),
+                         source="model")
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    gen = sub.add_parser("gen", help="write a golden dot set from the Python model")
+    gen.add_argument("path", type=Path)
+    gen.add_argument("--dots", type=int, default=100_000)
+    gen.add_argument("--seed", type=int, default=123)
+    info = sub.add_parser("info", help="print a store's metadata")
+    info.add_argument("path", type=Path)
+    args = ap.parse_args()
+
+    if args.cmd == "gen":
+        generate_dots(args.path, args.dots, args.seed)
+    store = VectorStore(args.path)
+    print(json.dumps(store.meta, indent=1))
+    print(f"rtl hash {'matches' if store.check_rtl() else 'differs from'} the current sources")
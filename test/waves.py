@@ -0,0 +1,76 @@
+"""
+Python-side waveform control for tb.v (make WAVES=..., see the Makefile).
+
+  TB_WAVES         no | yes | vcd | fst | fail   (exported from make WAVES)
+  TB_WAVES_WINDOW  "<start_ns>:<end_ns>"         capture only this sim-time window
+
+Dumping itself is opened by the +dump plusargs; Python only toggles
+tb.dump_en, which maps to $dumpon/$dumpoff. In fail mode nothing is
+captured until a test calls capture_failures(), which re-runs just the
+failing transactions with dumping on; only test_fuzz does, so the Makefile
+rejects WAVES=fail for other modules.
+"""
+import os
+
+import cocotb
+from cocotb.triggers import Timer
+from cocotb.utils import get_sim_time
+
+MODE   = os.environ.get("TB_WAVES", "no") or "no"
+WINDOW = os.environ.get("TB_WAVES_WINDOW", "")
+
+_window_task = None
+
+def open_window(dut):
+    """
+    Start the current test's WAVES_WINDOW watcher (no-op without a window or in
+    fail mode). harness.reset() calls this, so every TT-level test honours the
+    window; cocotb cancels the watcher with its test and the next reset() restarts it.
+    """
+    global _window_task
+    if MODE in ("no", "fail") or not WINDOW:
+        return
+    if _window_task is not None and not _window_task.done():
+        return
+    start, _, end = WINDOW.partition(":")
+    _window_task = cocotb.start_soon(_window(dut, float(start or 0), float(end) if end else None))
+
+async def _window(dut, start_ns: float, end_ns):
+    now = get_sim_time("ns")
+    if end_ns is not None and now >= end_ns:
+        return
+    if start_ns > now:
+        await Timer(start_ns - now, "ns")
+    dut.dump_en.value = 1
+    if end_ns is not None:
+        await Timer(end_ns - get_sim_time("ns"), "ns")
+        dut.dump_en.value = 0
+
+class Waves:
+    """Dump switch of one test; opens the configured window on creation."""
+
+    def __init__(self, dut):
+        self.dut = dut
+        self.enabled = MODE != "no"
+        self.on_fail = MODE == "fail"
+        open_window(dut)
+
+    def set(self, on: bool):
+        if self.enabled:
+            self.dut.dump_en.value = int(on)
+
+    async def capture_failures(self, rerun, failures, limit: int = 4):
+        """
+        Fail mode only: for each of the first 'limit' failures, dump while
+        'await rerun(failure)' replays it. Logs the sim time of each capture.
+        """
+        if not self.on_fail:
+            return
+        for failure in list(failures)[:limit]:
+            await Timer(1, "ns")    # callers often come straight out of a ReadOnly sample
+            start = get_sim_time("ns")
+            self.set(True)
+            await rerun(failure)
+            await Timer(1, "ns")
+            self.set(False)
+            self.dut._log.info(f"waves: failure {failure} captured at {start:.0f}..{get_sim_time('ns'):.0f} ns")